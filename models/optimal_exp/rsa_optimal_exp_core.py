@@ -16,6 +16,7 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 from scipy.special import gammaln, logsumexp
+from joblib import Parallel, effective_n_jobs
 
 USE_PRECISE_LOGSPACE = False
 
@@ -285,6 +286,44 @@ def log_column_softmax(X, alpha, precise=False):
 
 
 
+def make_parallel(
+    n_jobs: int,
+    backend: str = "loky",
+    n_tasks: Optional[int] = None,
+    verbose: int = 0
+) -> Parallel:
+    """
+    joblib.Parallel configured for the sampling and fitting task loops.
+    
+    Tasks there are small and each carries the World (and, when fitting, a
+    reference speaker) through pickling. Given n_tasks, tasks are sent in
+    about four batches per worker instead of joblib's auto batching, which
+    starts at one task per batch; each batch is pickled once, so the shared
+    objects travel a handful of times per worker. Arrays above joblib's
+    max_nbytes (1 MB) are still memory-mapped read-only by process backends.
+    
+    Parameters
+    ----------
+    n_jobs : int
+        Number of workers (joblib convention, -1 for all cores).
+    backend : str, default "loky"
+        Joblib backend.
+    n_tasks : Optional[int], default None
+        Number of tasks to be dispatched; None keeps batch_size="auto".
+    verbose : int, default 0
+        Joblib verbosity.
+    
+    Returns
+    -------
+    Parallel
+    """
+    batch_size = "auto"
+    if n_tasks is not None:
+        batch_size = max(1, n_tasks // (4 * effective_n_jobs(n_jobs)))
+    
+    return Parallel(n_jobs=n_jobs, backend=backend, verbose=verbose, batch_size=batch_size)
+
+
 # =============================================================================
 # WORLD CLASS
 # =============================================================================
@@ -344,6 +383,12 @@ class World:
                 self.n, self.m, self.theta_values, self.possible_outcomes
             )
 
+            # C-contiguous copy for row gathers (DataFrame.values is F-ordered);
+            # left out of pickles and rebuilt on first use (see __getstate__)
+            self._obs_log_likelihood_array = np.ascontiguousarray(
+                self.obs_log_likelihood_theta.values
+            )
+
             # Compute utterance truth values
             self.utterance_truth = self._compute_utterance_truth_values(
                 self.n, self.m, self.possible_outcomes,
@@ -352,6 +397,9 @@ class World:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize world state: {str(e)}")
 
+        # Derived tables memoized by shared_table()
+        self._shared_tables = {}
+
     def _validate_theta_values(
         self,
         theta_values: Optional[np.ndarray]
@@ -535,35 +583,26 @@ class World:
             log_binom = gammaln(m + 1) - gammaln(j_vals + 1) - gammaln(m - j_vals + 1)
             base_const = gammaln(n + 1)
 
-            results = []      # list to hold log-probability vectors (one per frequency tuple)
-            index_labels = [] # frequency tuples
-
-            for counts in possible_outcomes:
-                counts_arr = np.array(counts)
-                full_log_prob = np.empty(theta_values.size, dtype=float)
-
-                # For theta = 0 and theta = 1, assign manually:
-                for idx, theta in enumerate(theta_values):
-                    if theta == 0:
-                        full_log_prob[idx] = 0.0 if counts[0] == n else -np.inf
-                    elif theta == 1:
-                        full_log_prob[idx] = 0.0 if counts[m] == n else -np.inf
-
-                if np.any(mask_interior):
-                    interior_log_theta = np.log(theta_interior)
-                    interior_log_one_minus_theta = np.log(1 - theta_interior)
-                    base = base_const - np.sum(gammaln(counts_arr + 1))
-                    terms = (log_binom[:, None] +
-                            j_vals[:, None] * interior_log_theta +
-                            (m - j_vals)[:, None] * interior_log_one_minus_theta)
-                    log_term = np.sum(counts_arr[:, None] * terms, axis=0)
-                    interior_result = base + log_term
-                    full_log_prob[mask_interior] = interior_result
-
-                results.append(full_log_prob)
-                index_labels.append(counts)
-
-            results_array = np.array(results)
+            # Frequency tuples as a (num_outcomes, m+1) count matrix
+            counts_arr = np.array(possible_outcomes, dtype=float).reshape(-1, m + 1)
+            index_labels = list(possible_outcomes)
+            results_array = np.empty((counts_arr.shape[0], theta_values.size), dtype=float)
+
+            # theta = 0: all experiments yield 0 successes; theta = 1: all yield m
+            for idx, theta in enumerate(theta_values):
+                if theta == 0:
+                    results_array[:, idx] = np.where(counts_arr[:, 0] == n, 0.0, -np.inf)
+                elif theta == 1:
+                    results_array[:, idx] = np.where(counts_arr[:, m] == n, 0.0, -np.inf)
+
+            if np.any(mask_interior):
+                # Per-experiment log P(j | theta), shape (m+1, k), shared by all outcomes
+                terms = (log_binom[:, None] +
+                        j_vals[:, None] * np.log(theta_interior) +
+                        (m - j_vals)[:, None] * np.log1p(-theta_interior))
+                base = base_const - np.sum(gammaln(counts_arr + 1), axis=1)
+                results_array[:, mask_interior] = base[:, None] + counts_arr @ terms
+
             df = pd.DataFrame(results_array, index=index_labels, columns=theta_values)
             return df
         except Exception as e:
@@ -759,33 +798,16 @@ class World:
         pd.DataFrame
             DataFrame with columns: ['observation', 'theta', 'run_seed', 'round_index']
             Each row represents one sampled observation with its position in the sequence.
+            Observations are always frequency tuples.
         """
         # Validate inputs
         if not isinstance(n_round, int) or n_round < 1:
             raise ValueError("n_round must be a positive integer") 
         
-        if not 0 <= theta <= 1:
-            raise ValueError("theta must be between 0 and 1")
-        
-        # Find closest theta
-        closest_theta = self.theta_values[np.abs(self.theta_values - theta).argmin()]
-        if not np.isclose(theta, closest_theta, rtol=1e-10, atol=1e-10):
-            warnings.warn(
-                f"theta {theta} not exactly in theta_values. Using closest: {closest_theta}",
-                UserWarning
-            )
+        closest_theta, prob_values = self._observation_probabilities(theta)
         
-        # Get probabilities for this theta (computed once)
-        log_probs = self.obs_log_likelihood_theta[closest_theta]
-        probabilities = np.exp(log_probs)
-        observations_list = list(probabilities.index)
-        prob_values = probabilities.values
-        
-        # Validation checks
-        if not np.isclose(np.sum(prob_values), 1.0, rtol=1e-10):
-            raise ValueError(f"Probabilities don't sum to 1: {np.sum(prob_values)}")
-        if np.any(prob_values < 0):
-            raise ValueError("Found negative probabilities")
+        # Normalize labels to tuples once here so callers never need to re-check
+        observations_list = [tuple(obs) for obs in self.obs_log_likelihood_theta.index]
         
         # Sample using seeded RNG for reproducibility
         rng = np.random.default_rng(run_seed)
@@ -805,6 +827,83 @@ class World:
             "round_index": range(n_round)
         })
     
+    def _observation_probabilities(self, theta: float) -> Tuple[float, np.ndarray]:
+        """
+        Return (closest_theta, P(O | closest_theta)) for sampling, with
+        P ordered like obs_log_likelihood_theta.index.
+        """
+        if not 0 <= theta <= 1:
+            raise ValueError("theta must be between 0 and 1")
+        
+        # Find closest theta
+        theta_idx = np.abs(self.theta_values - theta).argmin()
+        closest_theta = self.theta_values[theta_idx]
+        if not np.isclose(theta, closest_theta, rtol=1e-10, atol=1e-10):
+            warnings.warn(
+                f"theta {theta} not exactly in theta_values. Using closest: {closest_theta}",
+                UserWarning
+            )
+        
+        # Get probabilities for this theta
+        prob_values = np.exp(self.obs_log_likelihood_theta[closest_theta].values)
+        
+        # Validation checks
+        if not np.isclose(np.sum(prob_values), 1.0, rtol=1e-10):
+            raise ValueError(f"Probabilities don't sum to 1: {np.sum(prob_values)}")
+        if np.any(prob_values < 0):
+            raise ValueError("Found negative probabilities")
+        
+        return closest_theta, prob_values
+    
+    def sample_run_indices(
+        self,
+        theta: float,
+        n_run: int,
+        n_round: int,
+        base_seed: int = None
+    ) -> Tuple[np.ndarray, List[Optional[int]]]:
+        """
+        Sample observations for multiple runs as row indices, without DataFrames.
+        
+        Draws exactly the sequences of sample_multiple_runs (run run_id uses
+        run_seed = base_seed + run_id), but returns positions in
+        obs_log_likelihood_theta.index instead of frequency tuples.
+        
+        Parameters
+        ----------
+        theta : float  
+            The theta value to sample from (will find closest available theta)
+        n_run : int
+            Number of independent simulation runs
+        n_round : int
+            Number of observations to sample per run
+        base_seed : int, default=None
+            Base random seed for reproducibility. Each run gets base_seed + run_id
+            
+        Returns
+        -------
+        Tuple[np.ndarray, List[Optional[int]]]
+            Indices of shape (n_run, n_round) and the run_seed of each run.
+            The observations themselves are observation_array[indices].
+        """
+        # Validate inputs
+        if not isinstance(n_run, int) or n_run < 1:
+            raise ValueError("n_run must be a positive integer")
+        if not isinstance(n_round, int) or n_round < 1:
+            raise ValueError("n_round must be a positive integer")
+        
+        _, prob_values = self._observation_probabilities(theta)
+        n_obs = len(prob_values)
+        
+        run_seeds = [None if base_seed is None else base_seed + run_id
+                     for run_id in range(n_run)]
+        indices = np.empty((n_run, n_round), dtype=np.intp)
+        for run_id, run_seed in enumerate(run_seeds):
+            rng = np.random.default_rng(run_seed)
+            indices[run_id] = rng.choice(n_obs, size=n_round, p=prob_values)
+        
+        return indices, run_seeds
+    
     def sample_multiple_runs(
         self, 
         theta: float, 
@@ -832,6 +931,7 @@ class World:
             DataFrame with columns: ['theta', 'run_id', 'round_index', 'observation', 'run_seed']
             Each row represents one sampled observation, with round_index indicating 
             the sequence position (0 to n_round-1) within each run.
+            Observations are always frequency tuples.
         """
         # Validate inputs
         if not isinstance(n_run, int) or n_run < 1:
@@ -867,6 +967,14 @@ class World:
         """Get list of all possible observations (frequency tuples)."""
         return list(self.obs_log_likelihood_theta.index)
 
+    @property
+    def observation_array(self) -> np.ndarray:
+        """
+        Return all possible observations as an int array of shape
+        (n_observations, m + 1), rows ordered like obs_log_likelihood_theta.index.
+        """
+        return np.array(self.obs_log_likelihood_theta.index.tolist(), dtype=int)
+
     @property
     def suc_likelihood_theta(self) -> pd.DataFrame:
         """
@@ -883,6 +991,53 @@ class World:
         """
         return np.exp(self.obs_log_likelihood_theta)
 
+    @property
+    def obs_log_likelihood_array(self) -> np.ndarray:
+        """
+        Return the observation log-likelihood table as a C-contiguous ndarray
+        (rows = observations, columns = theta values).
+        """
+        if self._obs_log_likelihood_array is None:
+            self._obs_log_likelihood_array = np.ascontiguousarray(
+                self.obs_log_likelihood_theta.values
+            )
+        return self._obs_log_likelihood_array
+
+    def shared_table(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return a derived table that depends only on this World, computing it
+        with compute() on first request and reusing it afterwards.
+
+        Used for tables that every speaker/listener on this World would
+        otherwise rebuild (e.g. the literal speaker's log P(u | O)). Shared
+        tables are read-only: callers replace, never modify, them.
+        """
+        table = self._shared_tables.get(key)
+        if table is None:
+            table = compute()
+            self._shared_tables[key] = table
+        return table
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle without the derived caches (shared tables and the contiguous
+        likelihood array), so saved results and worker copies stay the size
+        of the World itself; they are rebuilt on first use after loading.
+        """
+        state = self.__dict__.copy()
+        state.pop("_shared_tables", None)
+        state.pop("_obs_log_likelihood_array", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled World with empty derived caches. Also covers Worlds
+        pickled before the caches existed.
+        """
+        self.__dict__.update(state)
+        self._obs_log_likelihood_array = None
+        self._shared_tables = {}
+
 
 
 # =============================================================================
@@ -935,10 +1090,40 @@ class LiteralSpeaker:
         )
 
         # Precompute log P(u | O) for all utterance-observation pairs
-        self.utterance_log_prob_obs = self._compute_utterance_log_prob_obs(
-            self.world.utterance_truth
+        # (a function of the truth table only, so shared by the whole World)
+        self.utterance_log_prob_obs = self.world.shared_table(
+            "literal_utterance_log_prob_obs",
+            lambda: self._compute_utterance_log_prob_obs(self.world.utterance_truth)
         )
 
+        # Row position of each utterance in utterance_log_prob_obs
+        self._utt_index = {u: i for i, u in enumerate(self.utterance_log_prob_obs.index)}
+
+    @property
+    def utterance_log_prob_obs(self) -> pd.DataFrame:
+        """(U × O) table of log P(u | O)."""
+        return self._utterance_log_prob_obs
+
+    @utterance_log_prob_obs.setter
+    def utterance_log_prob_obs(self, table: pd.DataFrame) -> None:
+        # Replacing the table invalidates the per-observation array cache
+        self._utterance_log_prob_obs = table
+        self._utt_log_prob_arrays = {}
+
+    def utterance_log_prob_array(self, observation: Tuple[int, ...]) -> np.ndarray:
+        """
+        Return log P(u | observation) for all utterances as a NumPy array.
+
+        Arrays are cached per observation until utterance_log_prob_obs is
+        replaced; they follow the row order of utterance_log_prob_obs
+        (see self._utt_index) and must not be modified.
+        """
+        arr = self._utt_log_prob_arrays.get(observation)
+        if arr is None:
+            arr = self._utterance_log_prob_obs[observation].to_numpy()
+            self._utt_log_prob_arrays[observation] = arr
+        return arr
+
     def _process_initial_beliefs(
         self,
         initial_beliefs_theta: Optional[np.ndarray],
@@ -1019,7 +1204,11 @@ class LiteralSpeaker:
         # Mask out false utterance-observation pairs
         return df.where(truth, -np.inf)
 
-    def update_and_speak(self, observation: Tuple[int, ...]) -> str:
+    def update_and_speak(
+        self,
+        observation: Tuple[int, ...],
+        rng: Optional[np.random.Generator] = None
+    ) -> str:
         """
         Given a new frequency-tuple observation, update beliefs and sample an utterance.
 
@@ -1027,6 +1216,9 @@ class LiteralSpeaker:
         ----------
         observation : tuple of int
             A frequency tuple (n_0, n_1, ..., n_m) observed this round.
+        rng : np.random.Generator, optional
+            Random generator used for sampling. If None, the global
+            np.random state is used.
 
         Returns
         -------
@@ -1041,7 +1233,7 @@ class LiteralSpeaker:
             If belief update or utterance sampling fails.
         """
         # 1) Validate observation
-        if observation not in self.world.observations:
+        if observation not in self.world.obs_log_likelihood_theta.index:
             raise ValueError(f"Observation {observation} not supported by the world.")
 
         # 2) Compute total successes S = sum_j (j * n_j)
@@ -1049,19 +1241,21 @@ class LiteralSpeaker:
         successes = int(counts.dot(np.arange(self.world.m + 1)))
 
         # 3) Belief update in log-space: log P_new(theta) ∝ log P_old(theta) + log P(S | theta)
+        #    (rows of suc_log_likelihood_theta are indexed by s = 0..N)
         try:
-            log_lik = self.world.suc_log_likelihood_theta.loc[successes].values
+            log_lik = self.world.suc_log_likelihood_theta.values[successes]
             self.un_current_log_belief = self.un_current_log_belief + log_lik
         except Exception as e:
             raise RuntimeError(f"Belief update failed: {e}")
 
-        # 4) Sample utterance: P(u|O) stored in utterance_log_prob_obs[observation]
+        # 4) Sample utterance uniformly among the literally true ones,
+        #    i.e. those with finite log P(u|O)
         try:
-            uttrs = self.world.utterance_truth.loc[:, [observation]]
-            uttrs_true = uttrs.index[uttrs.iloc[:, 0] == 1].tolist()
+            is_true = np.isfinite(self.utterance_log_prob_array(observation))
+            uttrs_true = self._utterance_log_prob_obs.index[is_true].tolist()
             if not uttrs_true:
                 raise RuntimeError(f"No valid utterances for observation {observation}")
-            return np.random.choice(uttrs_true)
+            return (np.random if rng is None else rng).choice(uttrs_true)
         except Exception as e:
             raise RuntimeError(f"Utterance sampling failed: {e}")
 
@@ -1133,10 +1327,14 @@ class LiteralListener:
             self.literal_speaker = LiteralSpeaker(self.world, initial_beliefs_theta)
 
             # Precompute P(u|theta) = sum_O P(u|O) P(O|theta) in log-space
-            self.utterance_log_likelihood_theta = self._compute_utterance_log_likelihood_theta(
-                self.literal_speaker.utterance_log_prob_obs,
-                self.world.obs_log_likelihood_theta
+            # (independent of the prior, so shared by the whole World)
+            self.utterance_log_likelihood_theta = self.world.shared_table(
+                "literal_utterance_log_likelihood_theta",
+                lambda: self._compute_utterance_log_likelihood_theta(
+                    self.literal_speaker.utterance_log_prob_obs,
+                    self.world.obs_log_likelihood_theta
                 )
+            )
 
             # Combine with prior to get unnormalized log-posteriors for each utterance
             self.theta_log_post_utterance = self._compute_theta_log_post_utterance(
@@ -1408,9 +1606,38 @@ class PragmaticSpeaker_obs:
             # Compute utterance probabilities (this will cascade through all calculations)
             self.utterance_log_prob_obs = self._compute_utterance_log_prob_obs(self.alpha)
 
+            # Row position of each utterance in utterance_log_prob_obs
+            self._utt_index = {u: i for i, u in enumerate(self.utterance_log_prob_obs.index)}
+
         except Exception as e:
             raise RuntimeError(f"Failed to initialize pragmatic speaker: {str(e)}")
 
+    @property
+    def utterance_log_prob_obs(self) -> pd.DataFrame:
+        """(U × O) table of log P_S1(u | O)."""
+        return self._utterance_log_prob_obs
+
+    @utterance_log_prob_obs.setter
+    def utterance_log_prob_obs(self, table: pd.DataFrame) -> None:
+        # Replacing the table (e.g. after a listener update) invalidates
+        # the per-observation array cache
+        self._utterance_log_prob_obs = table
+        self._utt_log_prob_arrays = {}
+
+    def utterance_log_prob_array(self, observation: Tuple[int, ...]) -> np.ndarray:
+        """
+        Return log P_S1(u | observation) for all utterances as a NumPy array.
+
+        Arrays are cached per observation until utterance_log_prob_obs is
+        replaced; they follow the row order of utterance_log_prob_obs
+        (see self._utt_index) and must not be modified.
+        """
+        arr = self._utt_log_prob_arrays.get(observation)
+        if arr is None:
+            arr = self._utterance_log_prob_obs[observation].to_numpy()
+            self._utt_log_prob_arrays[observation] = arr
+        return arr
+
     def _compute_log_informativeness(
         self,
         obs_log_likelihood_theta_values: np.ndarray,
@@ -1552,7 +1779,7 @@ class PragmaticSpeaker_obs:
         try:
             # Compute informativeness
             self.unnormalized_log_prob_O, self.log_informativeness = self._compute_log_informativeness(
-                self.world.obs_log_likelihood_theta.values,
+                self.world.obs_log_likelihood_array,
                 self.literal_listener.un_current_log_belief,
                 self.literal_listener.literal_speaker.utterance_log_prob_obs
             )
@@ -1629,18 +1856,27 @@ class PragmaticSpeaker_obs:
         except Exception as e:
             raise RuntimeError(f"Failed to compute utterance probability table: {str(e)}")
 
-    def update_and_speak(self, observation: Tuple[int, ...]) -> str:
-        """Given an observation, update beliefs and sample an utterance."""
+    def update_and_speak(
+        self,
+        observation: Tuple[int, ...],
+        rng: Optional[np.random.Generator] = None
+    ) -> str:
+        """
+        Given an observation, update beliefs and sample an utterance.
+
+        If rng (np.random.Generator) is None, the global np.random state is used.
+        """
+        if rng is None:
+            rng = np.random
         try:
             # Bayesian optimal update using observation
             # i.e. update literal speaker's beliefs
-            self.literal_speaker.update_and_speak(observation)
+            self.literal_speaker.update_and_speak(observation, rng=rng)
 
             # Sample utterance according to P(u|O)
-            utterance_log_probs = self.utterance_log_prob_obs.loc[:, [observation]]
-            selected_utterance = np.random.choice(
-                utterance_log_probs.index,
-                p=np.exp(utterance_log_probs.values.flatten())
+            selected_utterance = rng.choice(
+                self._utterance_log_prob_obs.index,
+                p=np.exp(self.utterance_log_prob_array(observation))
             )
 
             # Only update internal state if update_internal is True
@@ -1772,7 +2008,7 @@ class PragmaticListener_obs_n:
                 self.alpha_vals,
                 self.world.utterances,
                 self.world.theta_values,
-                self.world.obs_log_likelihood_theta.values
+                self.world.obs_log_likelihood_array
             )
 
             # Combine with prior to get unnormalized posteriors
@@ -2031,7 +2267,7 @@ class PragmaticListener_obs_n:
                     self.alpha_vals,
                     self.world.utterances,
                     self.world.theta_values,
-                    self.world.obs_log_likelihood_theta.values
+                    self.world.obs_log_likelihood_array
                 )
 
             # 4) Rebuild Ln's unnormalized posterior table for next round
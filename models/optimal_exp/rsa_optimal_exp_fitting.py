@@ -4,18 +4,26 @@ rsa_optimal_exp_fitting.py
 Fitting functions for the RSA optimal experiment model.
 """
 
+import copy
 import warnings
 import itertools
 import numpy as np
 from typing import List, Dict, Union, Optional, Tuple, TypeVar, Iterator, Callable, Any, Literal
-from joblib import Parallel, delayed, cpu_count
+from joblib import delayed, cpu_count
 from scipy.special import logsumexp
 from scipy.optimize import minimize_scalar
 
 from rsa_optimal_exp_core import (
-    World, LiteralSpeaker, PragmaticSpeaker_obs, USE_PRECISE_LOGSPACE
+    World, LiteralSpeaker, PragmaticSpeaker_obs, USE_PRECISE_LOGSPACE, make_parallel
 )
 
+# JAX is optional: only used by array_backend="jax" in the grid-search kernel
+try:
+    import jax
+    import jax.numpy as jnp
+except ImportError:
+    jax = None
+
 np.seterr(divide='ignore', under='ignore')
 
 # =============================================================
@@ -624,10 +632,11 @@ def compute_literal_log_likelihood_multiT(
     
     # DISTRIBUTE RESULTS BACK TO NESTED STRUCTURE
     
+    utterances_by_theta = _utterances_by_theta(obs_data)
     for i, item in enumerate(flat_data):
         theta, obs_list_pos, speaker_key, alpha_key, utt_list_idx = item["location"]
         
-        utt_rec = obs_data["observations"][theta][obs_list_pos]["utterances"][speaker_key][alpha_key][utt_list_idx]
+        utt_rec = utterances_by_theta[theta][obs_list_pos][speaker_key][alpha_key][utt_list_idx]
         
         if utt_rec["log_lik_all_speaker"] is None:
             utt_rec["log_lik_all_speaker"] = {}
@@ -852,10 +861,11 @@ def compute_pragmatic_static_log_likelihood_multiT(
         )
     
     # Distribute results
+    utterances_by_theta = _utterances_by_theta(obs_data)
     for i, item in enumerate(flat_data):
         theta, obs_list_pos, speaker_key, alpha_key, utt_list_idx = item["location"]
         
-        utt_rec = obs_data["observations"][theta][obs_list_pos]["utterances"][speaker_key][alpha_key][utt_list_idx]
+        utt_rec = utterances_by_theta[theta][obs_list_pos][speaker_key][alpha_key][utt_list_idx]
         
         if utt_rec["log_lik_all_speaker"] is None:
             utt_rec["log_lik_all_speaker"] = {}
@@ -870,6 +880,26 @@ def compute_pragmatic_static_log_likelihood_multiT(
 
 
 
+def _make_alpha_grid(
+    alpha_bounds: Tuple[float, float],
+    grid_spacing: str,
+    n_grid: int,
+    include_determ: bool
+) -> List[Any]:
+    """Alpha grid shared by the static and dynamic grid searches."""
+    a_min, a_max = alpha_bounds
+    if grid_spacing == "log":
+        alphas = list(np.exp(np.linspace(np.log(a_min), np.log(a_max), n_grid)))
+    else:
+        alphas = list(np.linspace(a_min, a_max, n_grid))
+    
+    if include_determ:
+        alphas.append("determ")
+    
+    return alphas
+
+
+
 def _static_grid_search_multiT(
     flat_data: List[Dict[str, Any]],
     unique_obs_positions: List[List[Tuple[int, ...]]],
@@ -894,42 +924,89 @@ def _static_grid_search_multiT(
     Dict with "max_log_lik" and "optimal_alpha" lists.
     """
     
-    n_total = len(flat_data)
-    n_unique_obs = len(unique_obs_positions)
-    n_Ts = len(Ts)
-    T_indices = np.array(Ts, dtype=np.int32) - 1
-    
     # =========================================================================
     # PHASE 1: Create ONE speaker and extract utility table
     # =========================================================================
     
-    ref_speaker = PragmaticSpeaker_obs(
-        world=world,
-        omega="strat",
-        psi=psi,
-        update_internal=False,
-        alpha=1.0,
-        beta=0.0,
-        initial_beliefs_theta=None
-    )
+    ref_speaker, prior_tables = _pragmatic_prior_state(world, [psi])
     
     # Utility table: shape (n_utterances, n_observations)
-    utility_table = ref_speaker.utility.values
-    n_utterances, n_obs_total = utility_table.shape
+    utility_table = prior_tables[psi]
     
     # Index mappings
     obs_index = ref_speaker.utility.columns
     utt_index = ref_speaker.utility.index
-    utterances = list(utt_index)
-    utt_to_idx = {u: i for i, u in enumerate(utterances)}
     
     if verbose > 1:
         print(f"  utility_table: {utility_table.shape}, {utility_table.nbytes/1024/1024:.1f} MB")
     
     # =========================================================================
-    # PHASE 2: Build observation index arrays
+    # PHASES 2-3: Build observation and utterance index arrays
+    # =========================================================================
+    
+    obs_indices, utt_indices = _static_index_arrays(
+        flat_data, unique_obs_positions, obs_index, utt_index, max_T
+    )
+    
+    # =========================================================================
+    # PHASE 4: Extract utilities for all (item, time_step) pairs
+    # =========================================================================
+    
+    # Utilities for observed (utterance, observation) pairs: (n_total, max_T)
+    observed_utilities = utility_table[utt_indices, obs_indices]
+    
+    # Utilities for ALL utterances at each position: (n_total, max_T, n_utterances)
+    # Computed once, reused for all alphas
+    all_utilities_per_step = utility_table[:, obs_indices].transpose(1, 2, 0)
+    
+    if verbose > 1:
+        print(f"  all_utilities_per_step: {all_utilities_per_step.shape}, "
+              f"{all_utilities_per_step.nbytes/1024/1024:.1f} MB")
+    
+    # =========================================================================
+    # PHASE 5: Create alpha grid
+    # =========================================================================
+    
+    alphas = _make_alpha_grid(alpha_bounds, grid_spacing, n_grid, include_determ)
+    
+    # =========================================================================
+    # PHASE 6: Compute log P(u|O,α) for each alpha (loop for memory efficiency)
+    # =========================================================================
+    
+    all_lls = _log_liks_all_alphas(
+        observed_utilities, all_utilities_per_step, alphas, Ts, verbose
+    )
+    
+    # =========================================================================
+    # PHASE 7: Find optimal alpha for each (sequence, T)
     # =========================================================================
     
+    return _best_alpha_per_T(all_lls, alphas, Ts)
+
+
+
+def _static_index_arrays(
+    flat_data: List[Dict[str, Any]],
+    unique_obs_positions: List[List[Tuple[int, ...]]],
+    obs_index: 'pd.Index',
+    utt_index: 'pd.Index',
+    max_T: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map every (item, time_step) to its observation column and utterance row
+    in a (U × O) utility table.
+    
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        obs_indices and utt_indices, both shape (n_total, max_T).
+    """
+    
+    n_total = len(flat_data)
+    n_unique_obs = len(unique_obs_positions)
+    utt_to_idx = {u: i for i, u in enumerate(utt_index)}
+    
+    # Observation columns (looked up once per unique observation sequence)
     obs_flat_unique = list(itertools.chain.from_iterable(
         (tuple(obs) if not isinstance(obs, tuple) else obs for obs in obs_seq)
         for obs_seq in unique_obs_positions
@@ -947,84 +1024,187 @@ def _static_grid_search_multiT(
     )
     obs_indices = obs_indices_unique[unique_obs_idx_per_item]  # (n_total, max_T)
     
-    # =========================================================================
-    # PHASE 3: Build utterance index array
-    # =========================================================================
-    
+    # Utterance rows
     utt_flat = list(itertools.chain.from_iterable(item["utt_seq"] for item in flat_data))
     utt_indices_flat = np.array([utt_to_idx[u] for u in utt_flat], dtype=np.int32)
     utt_indices = utt_indices_flat.reshape(n_total, max_T)  # (n_total, max_T)
     
-    # =========================================================================
-    # PHASE 4: Extract utilities for all (item, time_step) pairs
-    # =========================================================================
-    
-    # Utilities for observed (utterance, observation) pairs: (n_total, max_T)
-    observed_utilities = utility_table[utt_indices, obs_indices]
-    
-    # Utilities for ALL utterances at each position: (n_total, max_T, n_utterances)
-    # Computed once, reused for all alphas
-    all_utilities_per_step = utility_table[:, obs_indices].transpose(1, 2, 0)
-    
-    if verbose > 1:
-        print(f"  all_utilities_per_step: {all_utilities_per_step.shape}, "
-              f"{all_utilities_per_step.nbytes/1024/1024:.1f} MB")
+    return obs_indices, utt_indices
+
+
+
+def _log_liks_all_alphas(
+    observed_utilities: np.ndarray,
+    all_utilities_per_step: np.ndarray,
+    alphas: List[Any],
+    Ts: List[int],
+    verbose: int = 0,
+    array_backend: Literal["numpy", "jax"] = "numpy"
+) -> np.ndarray:
+    """
+    Softmax-speaker log-likelihoods for every alpha in the grid.
     
-    # =========================================================================
-    # PHASE 5: Create alpha grid
-    # =========================================================================
+    Only the utilities seen at each step enter, so this serves the static
+    speaker (one fixed table) and the dynamic speaker (tables collected along
+    the listener walk) alike.
     
-    a_min, a_max = alpha_bounds
-    if grid_spacing == "log":
-        alphas = list(np.exp(np.linspace(np.log(a_min), np.log(a_max), n_grid)))
-    else:
-        alphas = list(np.linspace(a_min, a_max, n_grid))
+    Parameters
+    ----------
+    observed_utilities : np.ndarray
+        Shape (n_total, max_T), utility of the produced utterance at each step.
+    all_utilities_per_step : np.ndarray
+        Shape (n_total, max_T, n_utterances), utilities of all utterances.
+    alphas : List[Any]
+        Alpha grid (floats and/or "determ").
+    Ts : List[int]
+        Sequence lengths to compute likelihoods for.
+    verbose : int, default 0
+        Verbosity level.
+    array_backend : {"numpy", "jax"}, default "numpy"
+        "jax" computes the softmax log-probabilities of all numeric alphas in
+        one jitted call (on GPU if JAX has one); see _softmax_log_probs_jax.
     
-    if include_determ:
-        alphas.append("determ")
+    Returns
+    -------
+    np.ndarray
+        Shape (n_alphas, n_total, n_Ts) log-likelihoods.
+    """
     
     n_alphas = len(alphas)
+    n_total = observed_utilities.shape[0]
+    n_Ts = len(Ts)
+    T_indices = np.array(Ts, dtype=np.int32) - 1
     
-    # =========================================================================
-    # PHASE 6: Compute log P(u|O,α) for each alpha (loop for memory efficiency)
-    # =========================================================================
+    # Alpha-independent parts, computed once for the whole grid.
+    # For alpha >= 0, max_u(alpha * U) = alpha * max_u(U), so
+    # logsumexp_u(alpha * U) = alpha * max_U + log sum_u exp(alpha * (U - max_U))
+    max_utilities = np.max(all_utilities_per_step, axis=2)  # (n_total, max_T)
+    shift = np.where(np.isfinite(max_utilities), max_utilities, 0.0)
+    shifted_all = all_utilities_per_step - shift[:, :, np.newaxis]
+    shifted_observed = observed_utilities - shift
     
     # Output array: (n_alphas, n_total, n_Ts)
     all_lls = np.zeros((n_alphas, n_total, n_Ts))
     
+    if array_backend == "jax":
+        numeric_alphas = [alpha for alpha in alphas if alpha != "determ"]
+        jax_log_probs = iter(_softmax_log_probs_jax(
+            observed_utilities, all_utilities_per_step, numeric_alphas
+        ))
+    
     for alpha_idx, alpha in enumerate(alphas):
         if verbose > 1 and alpha_idx % 20 == 0:
             print(f"  Processing alpha {alpha_idx+1}/{n_alphas}")
         
         if alpha == "determ":
             # Deterministic: uniform over max-utility utterances
-            max_utilities = np.max(all_utilities_per_step, axis=2)  # (n_total, max_T)
             is_max = np.isclose(observed_utilities, max_utilities)
             is_max_all = np.isclose(all_utilities_per_step, max_utilities[:, :, np.newaxis])
             n_ties = np.sum(is_max_all, axis=2)
             log_probs = np.where(is_max, -np.log(n_ties), -np.inf)
+        elif array_backend == "jax":
+            log_probs = next(jax_log_probs)
         else:
-            # Softmax: P(u|O,α) = exp(α·U(u)) / Σ exp(α·U(u'))
-            scaled_observed = alpha * observed_utilities  # (n_total, max_T)
-            scaled_all = alpha * all_utilities_per_step   # (n_total, max_T, n_utterances)
-            log_normalizers = logsumexp(scaled_all, axis=2)  # (n_total, max_T)
-            log_probs = scaled_observed - log_normalizers
+            # Softmax: log P(u|O,α) = α·(U(u) - max_U) - log Σ exp(α·(U(u') - max_U))
+            log_normalizers = np.log(np.sum(np.exp(alpha * shifted_all), axis=2))
+            log_probs = alpha * shifted_observed - log_normalizers  # (n_total, max_T)
         
         # Cumulative sum and extract for Ts
         cumsum_log_probs = np.cumsum(log_probs, axis=1)  # (n_total, max_T)
         log_liks = cumsum_log_probs[:, T_indices]  # (n_total, n_Ts)
         
-        # Handle -inf propagation
-        has_neginf = np.isneginf(log_probs)
-        for t_idx, T in enumerate(Ts):
-            has_neginf_up_to_T = np.any(has_neginf[:, :T], axis=1)
-            log_liks[has_neginf_up_to_T, t_idx] = -np.inf
+        # Handle -inf propagation: any -inf step up to T makes the total -inf
+        has_neginf_up_to_T = np.logical_or.accumulate(np.isneginf(log_probs), axis=1)
+        log_liks[has_neginf_up_to_T[:, T_indices]] = -np.inf
         
         all_lls[alpha_idx] = log_liks
     
-    # =========================================================================
-    # PHASE 7: Find optimal alpha for each (sequence, T)
-    # =========================================================================
+    return all_lls
+
+
+
+def _softmax_log_probs_jax(
+    observed_utilities: np.ndarray,
+    all_utilities_per_step: np.ndarray,
+    numeric_alphas: List[float]
+) -> np.ndarray:
+    """
+    JAX version of the softmax step of _log_liks_all_alphas, for all numeric
+    alphas in one call.
+    
+    Parameters
+    ----------
+    observed_utilities : np.ndarray
+        Shape (n_total, max_T), utility of the produced utterance at each step.
+    all_utilities_per_step : np.ndarray
+        Shape (n_total, max_T, n_utterances), utilities of all utterances.
+    numeric_alphas : List[float]
+        Alpha values (no "determ").
+    
+    Returns
+    -------
+    np.ndarray
+        Shape (n_numeric_alphas, n_total, max_T) log P(u_t | O_t, alpha).
+    
+    Notes
+    -----
+    JAX computes in float32 unless 64-bit mode is enabled
+    (jax.config.update("jax_enable_x64", True)); enable it for results that
+    match the NumPy kernel to double precision.
+    """
+    if not numeric_alphas:
+        return np.empty((0,) + observed_utilities.shape)
+    
+    all_utilities = jnp.asarray(all_utilities_per_step)
+    return np.asarray(_softmax_log_probs_jitted(
+        jnp.asarray(observed_utilities),
+        all_utilities,
+        jnp.asarray(numeric_alphas, dtype=all_utilities.dtype)
+    ))
+
+
+if jax is not None:
+    @jax.jit
+    def _softmax_log_probs_jitted(observed_utilities, all_utilities_per_step, alphas):
+        # Same shift as the NumPy kernel: max_u(α·U) = α·max_u(U) for α >= 0
+        max_utilities = jnp.max(all_utilities_per_step, axis=2)
+        shift = jnp.where(jnp.isfinite(max_utilities), max_utilities, 0.0)
+        shifted_all = all_utilities_per_step - shift[:, :, jnp.newaxis]
+        shifted_observed = observed_utilities - shift
+        
+        def log_probs_for(alpha):
+            log_normalizers = jnp.log(jnp.sum(jnp.exp(alpha * shifted_all), axis=2))
+            return alpha * shifted_observed - log_normalizers
+        
+        # lax.map runs the alphas in sequence on the device, so only one
+        # (n_total, max_T, n_utterances) temporary is alive at a time
+        return jax.lax.map(log_probs_for, alphas)
+
+
+
+def _best_alpha_per_T(
+    all_lls: np.ndarray,
+    alphas: List[Any],
+    Ts: List[int]
+) -> Dict[str, List[Dict[int, Any]]]:
+    """
+    Pick the best alpha for each (sequence, T) from grid log-likelihoods.
+    
+    Parameters
+    ----------
+    all_lls : np.ndarray
+        Shape (n_alphas, n_total, n_Ts) log-likelihoods.
+    alphas : List[Any]
+        Alpha grid matching the first axis of all_lls.
+    Ts : List[int]
+        Sequence lengths matching the last axis of all_lls.
+    
+    Returns
+    -------
+    Dict with "max_log_lik" and "optimal_alpha" lists.
+    """
+    
+    n_total, n_Ts = all_lls.shape[1:]
     
     best_alpha_indices = np.argmax(all_lls, axis=0)  # (n_total, n_Ts)
     
@@ -1032,10 +1212,7 @@ def _static_grid_search_multiT(
     T_col_indices = np.arange(n_Ts)[np.newaxis, :]
     max_lls = all_lls[best_alpha_indices, row_indices, T_col_indices]
     
-    # =========================================================================
-    # PHASE 8: Convert to list of dicts
-    # =========================================================================
-    
+    # Convert to list of dicts
     alphas_array = np.array(alphas, dtype=object)
     
     max_log_lik_list = []
@@ -1128,7 +1305,7 @@ def _static_scipy_optimization_multiT(
     if n_jobs == 1:
         results = [optimize_single(task) for task in tasks]
     else:
-        results = Parallel(n_jobs=n_jobs, backend=backend, verbose=verbose)(
+        results = make_parallel(n_jobs, backend, n_tasks=len(tasks), verbose=verbose)(
             delayed(optimize_single)(task) for task in tasks
         )
     
@@ -1400,10 +1577,11 @@ def compute_pragmatic_dynamic_log_likelihood_multiT(
     # DISTRIBUTE RESULTS BACK TO NESTED STRUCTURE
     # =========================================================================
     
+    utterances_by_theta = _utterances_by_theta(obs_data)
     for i, item in enumerate(flat_data):
         theta, obs_list_pos, speaker_key, alpha_key, utt_list_idx = item["location"]
         
-        utt_rec = obs_data["observations"][theta][obs_list_pos]["utterances"][speaker_key][alpha_key][utt_list_idx]
+        utt_rec = utterances_by_theta[theta][obs_list_pos][speaker_key][alpha_key][utt_list_idx]
         
         if utt_rec["log_lik_all_speaker"] is None:
             utt_rec["log_lik_all_speaker"] = {}
@@ -1460,7 +1638,53 @@ def _dynamic_evaluate_sequence_all_alphas(
         Shape (n_alphas, n_Ts) log-likelihoods.
     """
     
-    steps_needed = max(Ts)
+    # Batch callers (_dynamic_grid_search_multiT) build the prior state once
+    # and call _dynamic_evaluate_sequence_multi_psi directly
+    ref_speaker, prior_tables = _pragmatic_prior_state(world, [psi])
+    
+    return _dynamic_evaluate_sequence_multi_psi(
+        obs_seq=[tuple(obs) for obs in obs_seq],
+        utt_seq=utt_seq,
+        ref_speaker=ref_speaker,
+        initial_tables=prior_tables,
+        psis=[psi],
+        alphas=alphas,
+        Ts=Ts,
+        obs_to_col={obs: j for j, obs in enumerate(ref_speaker.utility.columns)},
+        utt_to_idx={u: i for i, u in enumerate(ref_speaker.utility.index)}
+    )[psi]
+
+
+
+def _dynamic_log_liks_from_utilities(
+    utilities_matrix: np.ndarray,
+    utt_indices: np.ndarray,
+    alphas: List[Any],
+    Ts: List[int]
+) -> np.ndarray:
+    """
+    Log-likelihoods of one utterance sequence for all alphas and Ts, given
+    the (alpha-independent) utilities seen at each step.
+    
+    Parameters
+    ----------
+    utilities_matrix : np.ndarray
+        Shape (steps_needed, n_utterances), U(u, O_t) under the listener
+        state at step t.
+    utt_indices : np.ndarray
+        Shape (steps_needed,), index of the produced utterance at each step.
+    alphas : List[Any]
+        List of alpha values (floats and/or "determ").
+    Ts : List[int]
+        Sequence lengths to compute likelihoods for.
+    
+    Returns
+    -------
+    np.ndarray
+        Shape (n_alphas, n_Ts) log-likelihoods.
+    """
+    
+    steps_needed = utilities_matrix.shape[0]
     n_alphas = len(alphas)
     n_Ts = len(Ts)
     T_indices = np.array(Ts) - 1
@@ -1483,75 +1707,37 @@ def _dynamic_evaluate_sequence_all_alphas(
     has_numeric = len(numeric_alphas) > 0
     has_determ = determ_idx is not None
     
-    # =========================================================================
-    # CREATE SPEAKER (alpha value doesn't matter for utility extraction)
-    # =========================================================================
-    
-    speaker = PragmaticSpeaker_obs(
-        world=world,
-        omega="strat",
-        psi=psi,
-        update_internal=True,
-        alpha=1.0,
-        beta=0.0,
-        initial_beliefs_theta=None
-    )
-    
-    utterances = list(speaker.utility.index)
-    utt_to_idx = {u: i for i, u in enumerate(utterances)}
-    
-    # =========================================================================
-    # COLLECT UTILITIES AT EACH TIME STEP
-    # =========================================================================
-    # Loop is unavoidable: listener state at t depends on utterances u_0...u_{t-1}
-    
-    utilities_list = []
-    
-    for t in range(steps_needed):
-        obs = obs_seq[t]
-        obs_key = tuple(obs) if not isinstance(obs, tuple) else obs
-        
-        # Extract utilities directly from speaker.utility DataFrame
-        utilities = speaker.utility[obs_key].values.copy()
-        utilities_list.append(utilities)
-        
-        # Update listener with observed utterance
-        utt = utt_seq[t]
-        speaker.literal_listener.listen_and_update(utt)
-        
-        # Recompute utility table for new listener state
-        speaker.utterance_log_prob_obs = speaker._compute_utterance_log_prob_obs(speaker.alpha)
-    
-    # Stack: shape (steps_needed, n_utterances)
-    utilities_matrix = np.stack(utilities_list)
-    
-    # Observed utterance indices: shape (steps_needed,)
-    utt_indices = np.array([utt_to_idx[utt_seq[t]] for t in range(steps_needed)])
-    
     # =========================================================================
     # COMPUTE LOG PROBABILITIES FOR ALL ALPHAS AND TIME STEPS
     # =========================================================================
     
     all_log_probs = np.zeros((n_alphas, steps_needed))
     
+    # Max utility at each step (shared by the softmax shift and "determ")
+    max_utilities = np.max(utilities_matrix, axis=1)
+    
+    # Utility of observed utterance at each step
+    observed_utilities = utilities_matrix[np.arange(steps_needed), utt_indices]
+    
     if has_numeric:
         alphas_arr = np.array(numeric_alphas)
         
-        # Scale utilities: α * U(u, O)
-        # Shape: (n_numeric, steps_needed, n_utterances)
-        scaled_utilities = (alphas_arr[:, np.newaxis, np.newaxis] * 
-                          utilities_matrix[np.newaxis, :, :])
-        
-        # Log normalizers: logsumexp over utterances
-        # Shape: (n_numeric, steps_needed)
-        log_normalizers = logsumexp(scaled_utilities, axis=2)
+        # For alpha >= 0, max_u(α * U) = α * max_u(U): shift once for all alphas
+        shift = np.where(np.isfinite(max_utilities), max_utilities, 0.0)
+        shifted_utilities = utilities_matrix - shift[:, np.newaxis]
         
-        # Scaled utilities for observed utterances
+        # Log normalizers: log Σ_u exp(α * (U - max_U))
         # Shape: (n_numeric, steps_needed)
-        observed_scaled = scaled_utilities[:, np.arange(steps_needed), utt_indices]
+        log_normalizers = np.log(np.sum(
+            np.exp(alphas_arr[:, np.newaxis, np.newaxis] * shifted_utilities[np.newaxis, :, :]),
+            axis=2
+        ))
         
-        # Log P(u|O, α) = α*U(u) - logsumexp(α*U)
-        log_probs_numeric = observed_scaled - log_normalizers
+        # Log P(u|O, α) = α*(U(u) - max_U) - log Σ exp(α*(U - max_U))
+        log_probs_numeric = (
+            alphas_arr[:, np.newaxis] * (observed_utilities - shift)[np.newaxis, :]
+            - log_normalizers
+        )
         
         all_log_probs[np.array(numeric_indices), :] = log_probs_numeric
     
@@ -1560,12 +1746,6 @@ def _dynamic_evaluate_sequence_all_alphas(
     # =========================================================================
     
     if has_determ:
-        # Max utility at each step
-        max_utilities = np.max(utilities_matrix, axis=1)
-        
-        # Utility of observed utterance at each step
-        observed_utilities = utilities_matrix[np.arange(steps_needed), utt_indices]
-        
         # Check if observed is among maxima
         is_max = np.isclose(observed_utilities, max_utilities)
         
@@ -1584,11 +1764,9 @@ def _dynamic_evaluate_sequence_all_alphas(
     cumsum_log_probs = np.cumsum(all_log_probs, axis=1)
     all_lls = cumsum_log_probs[:, T_indices]
     
-    # Handle -inf propagation
-    has_neginf = np.isneginf(all_log_probs)
-    for t_idx, T in enumerate(Ts):
-        has_neginf_up_to_T = np.any(has_neginf[:, :T], axis=1)
-        all_lls[has_neginf_up_to_T, t_idx] = -np.inf
+    # Handle -inf propagation: any -inf step up to T makes the total -inf
+    has_neginf_up_to_T = np.logical_or.accumulate(np.isneginf(all_log_probs), axis=1)
+    all_lls[has_neginf_up_to_T[:, T_indices]] = -np.inf
     
     return all_lls
 
@@ -1617,37 +1795,33 @@ def _dynamic_grid_search_multiT(
     Dict with "max_log_lik" and "optimal_alpha" lists.
     """
     
-    n_total = len(flat_data)
-    n_Ts = len(Ts)
-    
     # Create alpha grid
-    a_min, a_max = alpha_bounds
-    if grid_spacing == "log":
-        alphas = list(np.exp(np.linspace(np.log(a_min), np.log(a_max), n_grid)))
-    else:
-        alphas = list(np.linspace(a_min, a_max, n_grid))
-    
-    if include_determ:
-        alphas.append("determ")
+    alphas = _make_alpha_grid(alpha_bounds, grid_spacing, n_grid, include_determ)
     
-    alphas_array = np.array(alphas, dtype=object)
+    # Prior speaker state, built once rather than per sequence
+    ref_speaker, prior_tables = _pragmatic_prior_state(world, [psi])
+    obs_to_col = {obs: j for j, obs in enumerate(ref_speaker.utility.columns)}
+    utt_to_idx = {u: i for i, u in enumerate(ref_speaker.utility.index)}
     
     # Worker function
     def evaluate_single(item):
-        return _dynamic_evaluate_sequence_all_alphas(
+        return _dynamic_evaluate_sequence_multi_psi(
             obs_seq=item["obs_seq"],
             utt_seq=item["utt_seq"],
-            world=world,
-            psi=psi,
+            ref_speaker=ref_speaker,
+            initial_tables=prior_tables,
+            psis=[psi],
             alphas=alphas,
-            Ts=Ts
-        )
+            Ts=Ts,
+            obs_to_col=obs_to_col,
+            utt_to_idx=utt_to_idx
+        )[psi]
     
     # Execute
     if n_jobs == 1:
         all_results = [evaluate_single(item) for item in flat_data]
     else:
-        all_results = Parallel(n_jobs=n_jobs, backend=backend, verbose=verbose)(
+        all_results = make_parallel(n_jobs, backend, n_tasks=len(flat_data), verbose=verbose)(
             delayed(evaluate_single)(item) for item in flat_data
         )
     
@@ -1656,30 +1830,7 @@ def _dynamic_grid_search_multiT(
     
     # Find optimal alpha for each (sequence, T)
     # Transpose to (n_alphas, n_total, n_Ts) for argmax
-    all_lls_T = all_lls.transpose(1, 0, 2)
-    best_alpha_indices = np.argmax(all_lls_T, axis=0)
-    
-    # Extract max log-likelihoods
-    row_idx = np.arange(n_total)[:, np.newaxis]
-    T_idx = np.arange(n_Ts)[np.newaxis, :]
-    max_lls = all_lls_T[best_alpha_indices, row_idx, T_idx]
-    
-    # Convert to list of dicts
-    max_log_lik_list = []
-    optimal_alpha_list = []
-    
-    for i in range(n_total):
-        max_log_lik_list.append({
-            T: float(max_lls[i, t_idx]) for t_idx, T in enumerate(Ts)
-        })
-        optimal_alpha_list.append({
-            T: alphas_array[best_alpha_indices[i, t_idx]] for t_idx, T in enumerate(Ts)
-        })
-    
-    return {
-        "max_log_lik": max_log_lik_list,
-        "optimal_alpha": optimal_alpha_list
-    }
+    return _best_alpha_per_T(all_lls.transpose(1, 0, 2), alphas, Ts)
 
 
 
@@ -1752,7 +1903,7 @@ def _dynamic_scipy_optimization_multiT(
     if n_jobs == 1:
         results = [optimize_single(task) for task in tasks]
     else:
-        results = Parallel(n_jobs=n_jobs, backend=backend, verbose=verbose)(
+        results = make_parallel(n_jobs, backend, n_tasks=len(tasks), verbose=verbose)(
             delayed(optimize_single)(task) for task in tasks
         )
     
@@ -1772,3 +1923,517 @@ def _dynamic_scipy_optimization_multiT(
     }
 
 
+
+# ==============================================================
+# Fitting pragmatic speakers for several psis in one pass
+# ==============================================================
+
+def compute_pragmatic_log_likelihood_multi_psi(
+    obs_data: Dict[str, Any],
+    psis: Tuple[str, ...] = ("inf", "pers+", "pers-"),
+    modes: Tuple[str, ...] = ("static", "dynamic"),
+    target_speaker_keys: Optional[List[str]] = None,
+    target_alpha_keys: Optional[List[Any]] = None,
+    alpha_bounds: Tuple[float, float] = (0.1, 50.0),
+    grid_spacing: Literal["log", "linear"] = "log",
+    n_grid: int = 100,
+    include_determ: bool = True,
+    n_jobs: int = 1,
+    backend: str = "loky",
+    batch_size: int = 2048,
+    array_backend: Literal["numpy", "jax"] = "numpy",
+    verbose: int = 0
+) -> None:
+    """
+    Grid-search fit of static and/or dynamic pragmatic speakers for several
+    psis in a single pass over the utterance sequences.
+    
+    Gives the same results as calling compute_pragmatic_static_log_likelihood_multiT
+    and compute_pragmatic_dynamic_log_likelihood_multiT (method="grid") once
+    per psi, but shares the work those calls repeat:
+    - utterance sequences are flattened and indexed once;
+    - the prior utility tables are computed once and serve both as the static
+      tables and as step 0 of every dynamic sequence;
+    - in the dynamic walk the literal listener (whose evolution depends only on
+      the utterances, not on psi) is updated once per step, and from each state
+      informativeness and persuasiveness are computed once each;
+    - the likelihood of a sequence depends only on the utilities seen at each
+      step, so the static tables and the dynamic walks of a batch are stacked
+      and scored for every (psi, mode) and alpha in one vectorized call.
+    
+    Parameters
+    ----------
+    obs_data : Dict[str, Any]
+        Output from sample_observation_sequences_multiT with utterances generated.
+    psis : Tuple[str, ...], default ("inf", "pers+", "pers-")
+        Fitting speaker goals.
+    modes : Tuple[str, ...], default ("static", "dynamic")
+        "static" for update_internal=False, "dynamic" for update_internal=True.
+    target_speaker_keys : Optional[List[str]], default None
+        Which generating speakers' utterances to evaluate. If None, all.
+    target_alpha_keys : Optional[List[Any]], default None
+        Which generating alphas' utterances to evaluate. If None, all.
+    alpha_bounds : Tuple[float, float], default (0.1, 50.0)
+        Search range for alpha.
+    grid_spacing : {"log", "linear"}, default "log"
+        Grid spacing.
+    n_grid : int, default 100
+        Number of grid points.
+    include_determ : bool, default True
+        Whether to also evaluate alpha="determ".
+    n_jobs : int, default 1
+        Number of parallel jobs over sequences (dynamic mode).
+    backend : str, default "loky"
+        Joblib backend.
+    batch_size : int, default 2048
+        Number of utterance sequences scored per call. Bounds the size of the
+        stacked (psi, mode, sequence, step, utterance) utility array.
+    array_backend : {"numpy", "jax"}, default "numpy"
+        Array library for scoring the stacked utilities. "jax" runs the
+        softmax over all alphas as one jitted kernel (GPU if available) and
+        falls back to "numpy" with a warning when JAX is not installed. The
+        listener walk always runs in NumPy.
+    verbose : int, default 0
+        Verbosity level.
+    
+    Returns
+    -------
+    None
+        Mutates obs_data in place.
+    
+    Notes
+    -----
+    Storage keys and structure are those of the single-psi functions:
+    "{psi}_F_fitted" for static and "{psi}_T_fitted" for dynamic, e.g.
+        utt_record["log_lik_all_speaker"]["persp_T_fitted"] = {
+            "max_log_lik": {T: float for T in Ts},
+            "optimal_alpha": {T: float or "determ" for T in Ts}
+        }
+    """
+    
+    # =========================================================================
+    # INPUT VALIDATION
+    # =========================================================================
+    
+    psis = list(dict.fromkeys(psis))
+    invalid_psis = [psi for psi in psis if psi not in ["inf", "pers+", "pers-"]]
+    if not psis or invalid_psis:
+        raise ValueError(f"psis must be a non-empty subset of 'inf', 'pers+', 'pers-', got {psis}")
+    
+    modes = list(dict.fromkeys(modes))
+    invalid_modes = [mode for mode in modes if mode not in ["static", "dynamic"]]
+    if not modes or invalid_modes:
+        raise ValueError(f"modes must be a non-empty subset of 'static', 'dynamic', got {modes}")
+    
+    if grid_spacing not in ["log", "linear"]:
+        raise ValueError(f"grid_spacing must be 'log' or 'linear', got '{grid_spacing}'")
+    
+    if backend not in ["loky", "multiprocessing", "threading"]:
+        raise ValueError(f"backend must be 'loky', 'multiprocessing', or 'threading'")
+    
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+    
+    if array_backend not in ["numpy", "jax"]:
+        raise ValueError(f"array_backend must be 'numpy' or 'jax', got '{array_backend}'")
+    
+    if array_backend == "jax" and jax is None:
+        warnings.warn("JAX is not installed; scoring with NumPy instead")
+        array_backend = "numpy"
+    
+    # =========================================================================
+    # EXTRACT CONFIGURATION
+    # =========================================================================
+    
+    world = obs_data["world"]
+    Ts = obs_data["config"]["Ts"]
+    max_T = obs_data["config"]["max_T"]
+    
+    invalid_Ts = [T for T in Ts if T < 1 or T > max_T]
+    if invalid_Ts:
+        raise ValueError(f"All T must satisfy 1 <= T <= {max_T}. Invalid: {invalid_Ts}")
+    
+    flat_data, unique_obs_positions = _flatten_utterance_records(
+        obs_data, target_speaker_keys, target_alpha_keys
+    )
+    n_total = len(flat_data)
+    
+    if verbose > 0:
+        print(f"Pragmatic speaker fitting (psis={psis}, modes={modes}, method=grid):")
+        print(f"  Processing {n_total} utterance sequences "
+              f"({len(unique_obs_positions)} unique obs)")
+        print(f"  Ts: {Ts}")
+        print(f"  Grid: {n_grid} points, spacing={grid_spacing}, bounds={alpha_bounds}")
+    
+    if n_total == 0:
+        if verbose > 0:
+            print("No utterance sequences to process")
+        return
+    
+    # =========================================================================
+    # SHARED RSA STATE
+    # =========================================================================
+    # One reference speaker provides the utility methods and the prior listener
+    
+    ref_speaker, initial_tables = _pragmatic_prior_state(world, psis)
+    obs_index = ref_speaker.utility.columns
+    utt_index = ref_speaker.utility.index
+    
+    alphas = _make_alpha_grid(alpha_bounds, grid_spacing, n_grid, include_determ)
+    
+    # Likelihoods for T <= max(Ts) only need the first max(Ts) steps
+    steps_needed = max(Ts)
+    obs_indices, utt_indices = _static_index_arrays(
+        flat_data, unique_obs_positions, obs_index, utt_index, max_T
+    )
+    obs_indices = obs_indices[:, :steps_needed]
+    utt_indices = utt_indices[:, :steps_needed]
+    
+    obs_to_col = {obs: j for j, obs in enumerate(obs_index)}
+    
+    def walk_single(item):
+        return _dynamic_utilities_multi_psi(
+            obs_seq=item["obs_seq"],
+            utt_seq=item["utt_seq"],
+            ref_speaker=ref_speaker,
+            initial_tables=initial_tables,
+            psis=psis,
+            steps_needed=steps_needed,
+            obs_to_col=obs_to_col
+        )
+    
+    # One block of utilities per (psi, mode), all scored together
+    blocks = [(psi, mode) for mode in modes for psi in psis]
+    n_utterances = len(utt_index)
+    all_lls = np.empty((len(alphas), len(blocks), n_total, len(Ts)))
+    
+    for start in range(0, n_total, batch_size):
+        stop = min(start + batch_size, n_total)
+        
+        # =====================================================================
+        # COLLECT UTILITIES: (block, sequence, step, utterance)
+        # =====================================================================
+        
+        utilities = np.empty((len(blocks), stop - start, steps_needed, n_utterances))
+        
+        # Static: one fixed utility table per psi
+        if "static" in modes:
+            for psi in psis:
+                utilities[blocks.index((psi, "static"))] = (
+                    initial_tables[psi][:, obs_indices[start:stop]].transpose(1, 2, 0)
+                )
+        
+        # Dynamic: one listener walk per sequence, all psis per step
+        if "dynamic" in modes:
+            if n_jobs == 1:
+                walks = [walk_single(item) for item in flat_data[start:stop]]
+            else:
+                walks = make_parallel(n_jobs, backend, n_tasks=stop - start, verbose=verbose)(
+                    delayed(walk_single)(item) for item in flat_data[start:stop]
+                )
+            for psi in psis:
+                utilities[blocks.index((psi, "dynamic"))] = [walk[psi] for walk in walks]
+        
+        # =====================================================================
+        # SCORE ALL BLOCKS AND ALPHAS AT ONCE
+        # =====================================================================
+        
+        observed = np.take_along_axis(
+            utilities, utt_indices[np.newaxis, start:stop, :, np.newaxis], axis=3
+        )[..., 0]
+        batch_lls = _log_liks_all_alphas(
+            observed.reshape(-1, steps_needed),
+            utilities.reshape(-1, steps_needed, n_utterances),
+            alphas, Ts, verbose, array_backend
+        )
+        all_lls[:, :, start:stop] = batch_lls.reshape(len(alphas), len(blocks), stop - start, len(Ts))
+        
+        del utilities, observed
+    
+    results = {
+        block: _best_alpha_per_T(all_lls[:, k], alphas, Ts)
+        for k, block in enumerate(blocks)
+    }
+    
+    # =========================================================================
+    # DISTRIBUTE RESULTS BACK TO NESTED STRUCTURE
+    # =========================================================================
+    
+    utterances_by_theta = _utterances_by_theta(obs_data)
+    for (psi, mode), res in results.items():
+        psi_prefix = {"inf": "inf", "pers+": "persp", "pers-": "persm"}[psi]
+        fitted_key = f"{psi_prefix}_{'F' if mode == 'static' else 'T'}_fitted"
+        
+        for i, item in enumerate(flat_data):
+            theta, obs_list_pos, speaker_key, alpha_key, utt_list_idx = item["location"]
+            
+            utt_rec = utterances_by_theta[theta][obs_list_pos][speaker_key][alpha_key][utt_list_idx]
+            
+            if utt_rec["log_lik_all_speaker"] is None:
+                utt_rec["log_lik_all_speaker"] = {}
+            
+            # Dynamic results merge into existing entries, as in
+            # compute_pragmatic_dynamic_log_likelihood_multiT
+            existing = utt_rec["log_lik_all_speaker"].get(fitted_key)
+            if mode == "dynamic" and existing is not None:
+                existing["max_log_lik"].update(res["max_log_lik"][i])
+                existing["optimal_alpha"].update(res["optimal_alpha"][i])
+            else:
+                utt_rec["log_lik_all_speaker"][fitted_key] = {
+                    "max_log_lik": res["max_log_lik"][i],
+                    "optimal_alpha": res["optimal_alpha"][i]
+                }
+    
+    if verbose > 0:
+        print(f"Completed: stored results for {len(results)} (psi, mode) combinations")
+
+
+
+def _utterances_by_theta(obs_data: Dict[str, Any]) -> Dict[float, List[Dict[str, Any]]]:
+    """
+    Map theta -> list of each observation's "utterances" dict.
+    
+    Lets write-back loops index utterances directly instead of building an
+    observation record per utterance. Accepts ObservationRecords and plain
+    lists of observation dicts (as in saved results).
+    """
+    return {
+        theta: (
+            observations.utterances if hasattr(observations, "utterances")
+            else [obs_info["utterances"] for obs_info in observations]
+        )
+        for theta, observations in obs_data["observations"].items()
+    }
+
+
+def _flatten_utterance_records(
+    obs_data: Dict[str, Any],
+    target_speaker_keys: Optional[List[str]],
+    target_alpha_keys: Optional[List[Any]]
+) -> Tuple[List[Dict[str, Any]], List[List[Tuple[int, ...]]]]:
+    """
+    Flatten all utterance sequences with location tracking.
+    
+    Returns
+    -------
+    Tuple[List[Dict[str, Any]], List[List[Tuple[int, ...]]]]
+        flat_data items with "obs_seq", "utt_seq", "obs_unique_idx" and
+        "location", and the list of unique observation sequences.
+    """
+    
+    max_T = obs_data["config"]["max_T"]
+    
+    flat_data = []
+    unique_obs_positions = []
+    
+    for theta in obs_data["config"]["thetas"]:
+        for obs_list_pos, obs_info in enumerate(obs_data["observations"][theta]):
+            obs_seq = obs_info["obs_seq"]
+            obs_idx = obs_info["obs_idx"]
+            
+            if len(obs_seq) != max_T:
+                raise ValueError(
+                    f"Observation sequence length mismatch at theta={theta}, obs_idx={obs_idx}"
+                )
+            
+            if obs_info["utterances"] is None:
+                continue
+            
+            obs_unique_idx = len(unique_obs_positions)
+            unique_obs_positions.append(obs_seq)
+            
+            for speaker_key, alpha_dict in obs_info["utterances"].items():
+                if target_speaker_keys is not None and speaker_key not in target_speaker_keys:
+                    continue
+                
+                for alpha_key, utt_records in alpha_dict.items():
+                    if target_alpha_keys is not None and alpha_key not in target_alpha_keys:
+                        continue
+                    
+                    for utt_list_idx, utt_rec in enumerate(utt_records):
+                        utt_seq = utt_rec["utt_seq"]
+                        
+                        if len(utt_seq) != max_T:
+                            raise ValueError(
+                                f"Utterance sequence length mismatch at theta={theta}, "
+                                f"obs_idx={obs_idx}, speaker_key={speaker_key}"
+                            )
+                        
+                        flat_data.append({
+                            "obs_seq": obs_seq,
+                            "utt_seq": utt_seq,
+                            "obs_unique_idx": obs_unique_idx,
+                            "location": (theta, obs_list_pos, speaker_key, alpha_key, utt_list_idx)
+                        })
+    
+    return flat_data, unique_obs_positions
+
+
+
+def _pragmatic_prior_state(
+    world: 'World',
+    psis: List[str]
+) -> Tuple[PragmaticSpeaker_obs, Dict[str, np.ndarray]]:
+    """
+    Reference speaker and prior utility tables for the fitting speakers
+    (omega="strat", beta=0, uniform prior).
+    
+    The prior tables depend only on the World and psi, so they are memoized
+    with World.shared_table and reused across psis, static and dynamic fits,
+    and repeated calls. They live only in memory: World pickles leave the
+    shared tables out, so saved results do not carry them.
+    
+    Returns
+    -------
+    Tuple[PragmaticSpeaker_obs, Dict[str, np.ndarray]]
+        The reference speaker (its literal_listener is the prior listener;
+        it must not be updated) and the (U × O) prior utility table per psi.
+    """
+    ref_speaker = PragmaticSpeaker_obs(
+        world=world,
+        omega="strat",
+        psi=psis[0],
+        update_internal=False,
+        alpha=1.0,
+        beta=0.0,
+        initial_beliefs_theta=None
+    )
+    
+    tables = {
+        psi: world.shared_table(
+            f"fitting_prior_utility_{psi}",
+            lambda psi=psi: _utility_tables_multi_psi(
+                ref_speaker, ref_speaker.literal_listener, [psi]
+            )[psi]
+        )
+        for psi in psis
+    }
+    
+    return ref_speaker, tables
+
+
+
+def _utility_tables_multi_psi(
+    speaker: PragmaticSpeaker_obs,
+    listener: 'LiteralListener',
+    psis: List[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Utility tables V(u; O, psi) for several psis under one listener state.
+    
+    Matches PragmaticSpeaker_obs._compute_utility with beta=0 (as used for
+    fitting), but computes informativeness only for psi="inf" and
+    persuasiveness only for the persuasive psis, once each.
+    
+    Parameters
+    ----------
+    speaker : PragmaticSpeaker_obs
+        Any pragmatic speaker on the same World (only its methods are used).
+    listener : LiteralListener
+        Literal listener whose current state defines the utilities.
+    psis : List[str]
+        Speaker goals to compute tables for.
+    
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        (U × O) utility array per psi, ordered like speaker.utility.
+    """
+    world = speaker.world
+    uttr_false = world.utterance_truth.values == 0
+    
+    tables = {}
+    for psi in psis:
+        if psi == "inf":
+            _, util = speaker._compute_log_informativeness(
+                world.obs_log_likelihood_array,
+                listener.un_current_log_belief,
+                listener.literal_speaker.utterance_log_prob_obs
+            )
+        else:
+            _, util = speaker._compute_log_persuasiveness(
+                psi,
+                world.theta_values,
+                listener.theta_log_post_utterance.values
+            )
+        tables[psi] = np.where(uttr_false, -np.inf, util.values)
+    
+    return tables
+
+
+
+def _dynamic_evaluate_sequence_multi_psi(
+    obs_seq: List[Tuple[int, ...]],
+    utt_seq: List[str],
+    ref_speaker: PragmaticSpeaker_obs,
+    initial_tables: Dict[str, np.ndarray],
+    psis: List[str],
+    alphas: List[Any],
+    Ts: List[int],
+    obs_to_col: Dict[Tuple[int, ...], int],
+    utt_to_idx: Dict[str, int]
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate log-likelihoods for one sequence across all alphas and Ts for
+    every psi, with a single listener walk.
+    
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Shape (n_alphas, n_Ts) log-likelihoods per psi.
+    """
+    
+    steps_needed = max(Ts)
+    utilities = _dynamic_utilities_multi_psi(
+        obs_seq, utt_seq, ref_speaker, initial_tables, psis, steps_needed, obs_to_col
+    )
+    
+    utt_indices = np.array([utt_to_idx[utt_seq[t]] for t in range(steps_needed)])
+    
+    return {
+        psi: _dynamic_log_liks_from_utilities(utilities[psi], utt_indices, alphas, Ts)
+        for psi in psis
+    }
+
+
+
+def _dynamic_utilities_multi_psi(
+    obs_seq: List[Tuple[int, ...]],
+    utt_seq: List[str],
+    ref_speaker: PragmaticSpeaker_obs,
+    initial_tables: Dict[str, np.ndarray],
+    psis: List[str],
+    steps_needed: int,
+    obs_to_col: Dict[Tuple[int, ...], int]
+) -> Dict[str, np.ndarray]:
+    """
+    Walk the listener along one sequence and collect, for every psi, the
+    utilities of all utterances at each step.
+    
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Shape (steps_needed, n_utterances) utilities per psi; row t holds
+        U(u, O_t) under the listener state after u_0...u_{t-1}.
+    """
+    
+    n_utterances = next(iter(initial_tables.values())).shape[0]
+    
+    # Fresh listener at the prior; listen_and_update rebinds its arrays
+    # instead of modifying them, so a shallow copy leaves ref_speaker intact
+    listener = copy.copy(ref_speaker.literal_listener)
+    
+    utilities = {psi: np.empty((steps_needed, n_utterances)) for psi in psis}
+    tables = initial_tables
+    
+    # Loop is unavoidable: listener state at t depends on utterances u_0...u_{t-1}
+    for t in range(steps_needed):
+        col = obs_to_col[obs_seq[t]]
+        for psi in psis:
+            utilities[psi][t] = tables[psi][:, col]
+        
+        if t + 1 < steps_needed:
+            listener.listen_and_update(utt_seq[t])
+            tables = _utility_tables_multi_psi(ref_speaker, listener, psis)
+    
+    return utilities
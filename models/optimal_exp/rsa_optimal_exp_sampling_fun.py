@@ -12,17 +12,204 @@ Stage 2: generate_utterances_for_observations_multiT()
 import numpy as np
 import pandas as pd
 import warnings
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional, Any, Union
-from joblib import Parallel, delayed, cpu_count
+from joblib import delayed, cpu_count
 
 from rsa_optimal_exp_core import (
-    World, LiteralSpeaker, PragmaticSpeaker_obs, USE_PRECISE_LOGSPACE
+    World, LiteralSpeaker, PragmaticSpeaker_obs, USE_PRECISE_LOGSPACE, make_parallel
 )
 
 np.seterr(divide='ignore', under='ignore')
 
 
 
+# =============================================================================
+# OBSERVATION STORAGE
+# =============================================================================
+
+@dataclass
+class ObservationRecords:
+    """
+    Observation sequences and likelihoods for a single theta, stored as arrays.
+    
+    Each field holds one column for all n_obs_seq observation sequences, so
+    downstream analysis can be vectorized, e.g. the mean absolute MLE error at
+    Ts[t_idx] is np.mean(np.abs(records.mle[:, t_idx] - records.theta)).
+    
+    Indexing (records[obs_idx], or a slice for a list) and iteration yield
+    per-observation read-only mappings with the keys "obs_idx", "obs_seq",
+    "obs_run_seed", "theta", "log_lik_true_theta", "log_lik_all_theta",
+    "mle_theta" and "utterances", as documented in
+    sample_observation_sequences_multiT. Values are built from the arrays
+    on access, so records[obs_idx]["utterances"] is cheap; the
+    "log_lik_all_theta" arrays are non-writable views of log_lik_all. The
+    "utterances" dict is shared with this object, so filling it in place (as
+    Stage 2 and the fitting functions do) persists, and assigning
+    record["utterances"] writes through; any other key raises TypeError.
+    Loops over many records should read the utterances list directly.
+    
+    Attributes
+    ----------
+    theta : float
+        The true theta the sequences were sampled from.
+    Ts : List[int]
+        Sequence lengths; column t_idx of the likelihood arrays refers to Ts[t_idx].
+    obs_seqs : np.ndarray
+        Shape (n_obs_seq, max_T, m + 1) frequency tuples.
+    obs_run_seeds : List[Optional[int]]
+        run_seed used by world.sample_run_indices() for each sequence.
+    log_lik_true : Optional[np.ndarray]
+        Shape (n_obs_seq, len(Ts)), log P(obs_seq[:T] | theta).
+        None if compute_obs_likelihood == "none".
+    log_lik_all : Optional[np.ndarray]
+        Shape (n_obs_seq, len(Ts), n_theta_vals), log P(obs_seq[:T] | theta')
+        for all theta' in world.theta_values.
+        None if compute_obs_likelihood != "all".
+    mle : Optional[np.ndarray]
+        Shape (n_obs_seq, len(Ts)), argmax_theta' P(obs_seq[:T] | theta').
+        None if compute_obs_likelihood != "all".
+    utterances : List[Dict]
+        Per-sequence utterance storage (filled by Stage 2).
+    """
+    
+    theta: float
+    Ts: List[int]
+    obs_seqs: np.ndarray
+    obs_run_seeds: List[Optional[int]]
+    log_lik_true: Optional[np.ndarray] = None
+    log_lik_all: Optional[np.ndarray] = None
+    mle: Optional[np.ndarray] = None
+    utterances: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __post_init__(self) -> None:
+        if not self.utterances:
+            self.utterances = [{} for _ in range(len(self))]
+    
+    def __len__(self) -> int:
+        return self.obs_seqs.shape[0]
+    
+    def __iter__(self):
+        return (_ObservationView(self, obs_idx) for obs_idx in range(len(self)))
+    
+    def __getitem__(
+        self, obs_idx: Union[int, slice]
+    ) -> Union["_ObservationView", List["_ObservationView"]]:
+        """Return the record for one observation sequence (a list for a slice)."""
+        n_obs_seq = len(self)
+        if isinstance(obs_idx, slice):
+            return [_ObservationView(self, i) for i in range(*obs_idx.indices(n_obs_seq))]
+        if not -n_obs_seq <= obs_idx < n_obs_seq:
+            raise IndexError(f"obs_idx {obs_idx} out of range for {n_obs_seq} sequences")
+        return _ObservationView(self, obs_idx % n_obs_seq)
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """
+        Plain per-observation dicts, as stored before ObservationRecords.
+        
+        Used when saving results, so files keep that schema and load without
+        this module. Columns are converted to Python objects once, not once
+        per record.
+        """
+        n_obs_seq = len(self)
+        obs_seqs = self.obs_seqs.tolist()
+        log_lik_true = (
+            [None] * n_obs_seq if self.log_lik_true is None
+            else self.log_lik_true.tolist()
+        )
+        # One copy of the column, so the per-record arrays do not alias it
+        log_lik_all = (
+            [None] * n_obs_seq if self.log_lik_all is None
+            else self.log_lik_all.copy()
+        )
+        mle = [None] * n_obs_seq if self.mle is None else self.mle.tolist()
+        
+        return [
+            {
+                "obs_idx": obs_idx,
+                "obs_seq": list(map(tuple, obs_seqs[obs_idx])),
+                "obs_run_seed": self.obs_run_seeds[obs_idx],
+                "theta": self.theta,
+                "log_lik_true_theta": self._by_T(log_lik_true[obs_idx]),
+                "log_lik_all_theta": self._by_T(log_lik_all[obs_idx]),
+                "mle_theta": self._by_T(mle[obs_idx]),
+                "utterances": self.utterances[obs_idx]
+            }
+            for obs_idx in range(n_obs_seq)
+        ]
+    
+    def _by_T(self, row: Optional[Any]) -> Optional[Dict[int, Any]]:
+        """{T: value} for one row of a per-T column (None stays None)."""
+        return None if row is None else dict(zip(self.Ts, row))
+
+
+class _ObservationView(Mapping):
+    """
+    Read-only record of one observation sequence in an ObservationRecords.
+    
+    Values are computed from the arrays on access. Only "utterances" can be
+    assigned (it writes through to records.utterances).
+    """
+    
+    __slots__ = ("_records", "_obs_idx")
+    
+    _KEYS = (
+        "obs_idx", "obs_seq", "obs_run_seed", "theta",
+        "log_lik_true_theta", "log_lik_all_theta", "mle_theta", "utterances"
+    )
+    
+    def __init__(self, records: ObservationRecords, obs_idx: int) -> None:
+        self._records = records
+        self._obs_idx = obs_idx
+    
+    def __getitem__(self, key: str) -> Any:
+        records, obs_idx = self._records, self._obs_idx
+        if key == "utterances":
+            return records.utterances[obs_idx]
+        if key == "obs_idx":
+            return obs_idx
+        if key == "obs_seq":
+            return list(map(tuple, records.obs_seqs[obs_idx].tolist()))
+        if key == "obs_run_seed":
+            return records.obs_run_seeds[obs_idx]
+        if key == "theta":
+            return records.theta
+        if key == "log_lik_true_theta":
+            column = records.log_lik_true
+            return None if column is None else records._by_T(column[obs_idx].tolist())
+        if key == "log_lik_all_theta":
+            column = records.log_lik_all
+            if column is None:
+                return None
+            # Rows are views into the shared column; hand them out read-only
+            row = column[obs_idx]
+            row.flags.writeable = False
+            return records._by_T(row)
+        if key == "mle_theta":
+            column = records.mle
+            return None if column is None else records._by_T(column[obs_idx].tolist())
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key != "utterances":
+            raise TypeError(
+                f"Observation records are read-only except 'utterances'; "
+                f"cannot set {key!r} (update the ObservationRecords arrays instead)"
+            )
+        self._records.utterances[self._obs_idx] = value
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+
 # =============================================================================
 # STAGE 1: OBSERVATION SAMPLING
 # =============================================================================
@@ -35,7 +222,10 @@ def sample_observation_sequences_multiT(
     n_obs_seq: int,
     random_seed: Optional[int] = None,
     theta_values: Optional[np.ndarray] = None,
-    compute_obs_likelihood: str = "none"
+    compute_obs_likelihood: str = "none",
+    n_jobs: int = 1,
+    backend: str = "threading",
+    world: Optional[World] = None
 ) -> Dict[str, Any]:
     """
     Sample observation sequences and compute likelihoods for multiple sequence lengths.
@@ -57,7 +247,9 @@ def sample_observation_sequences_multiT(
     random_seed : Optional[int], default None
         Base random seed for reproducibility.
         The same seed is used for all thetas (sequences differ due to different
-        theta parameters, not different seeds).
+        theta parameters, not different seeds). Run run_id is drawn from its
+        own generator seeded with random_seed + run_id, so results are the
+        same whichever worker samples which theta.
     theta_values : Optional[np.ndarray], default None
         Custom theta grid for the World. If None, uses World's default [0, 0.1, ..., 1].
     compute_obs_likelihood : str, default "none"
@@ -67,6 +259,16 @@ def sample_observation_sequences_multiT(
                   (optimized: only loads single column from likelihood table)
         - "all": Compute log P(obs_seq[:T] | theta) for all thetas and each T,
                  plus MLE theta for each T
+    n_jobs : int, default 1
+        Number of parallel jobs over thetas (-1 for all cores).
+    backend : str, default "threading"
+        Joblib backend. Per-theta sampling is a few NumPy calls, so threads
+        avoid the process start-up and World pickling that would dominate;
+        results do not depend on the backend or n_jobs (see random_seed).
+    world : Optional[World], default None
+        Pre-built World to reuse (e.g. across repeated calls with the same
+        n, m and theta grid), skipping construction of its likelihood tables.
+        Must match n and m; theta_values is ignored when given.
     
     Returns
     -------
@@ -89,13 +291,15 @@ def sample_observation_sequences_multiT(
                 "compute_obs_likelihood": str
             }
         
-        - "observations": Dict[float, List[Dict]]
-            Mapping from theta -> list of observation data.
-            Each observation data dict contains:
+        - "observations": Dict[float, ObservationRecords]
+            Mapping from theta -> observation data stored as arrays
+            (see ObservationRecords). Indexing or iterating yields one
+            read-only mapping per observation sequence (saved files hold
+            plain lists of these dicts):
             {
                 "obs_idx": int,
                 "obs_seq": List[Tuple[int, ...]],   # Full sequence (length max_T)
-                "obs_run_seed": int, # run_seed output from world.sample_multiple_runs()
+                "obs_run_seed": int, # run_seed used by world.sample_run_indices()
                 "theta": float,
                 "log_lik_true_theta": Optional[Dict[int, float]],
                     # {T: log P(obs_seq[:T] | true_theta)} for each T in Ts
@@ -106,8 +310,8 @@ def sample_observation_sequences_multiT(
                 "mle_theta": Optional[Dict[int, float]],
                     # {T: argmax_theta P(obs_seq[:T] | theta)} for each T
                     # None if compute_obs_likelihood != "all"
-                "utterances": None
-                    # Placeholder for utterance generation (to be filled by Stage 2)
+                "utterances": Dict
+                    # Empty; filled in place by Stage 2
             }
     
     Raises
@@ -135,11 +339,9 @@ def sample_observation_sequences_multiT(
     >>> mle_T10 = obs_info["mle_theta"][10]
     
     >>> # Compare MLE accuracy across different T values
-    >>> for T in obs_data["config"]["Ts"]:
-    ...     mle_errors = [
-    ...         abs(obs["mle_theta"][T] - obs["theta"])
-    ...         for obs in obs_data["observations"][0.5]
-    ...     ]
+    >>> records = obs_data["observations"][0.5]
+    >>> for t_idx, T in enumerate(obs_data["config"]["Ts"]):
+    ...     mle_errors = np.abs(records.mle[:, t_idx] - records.theta)
     ...     print(f"T={T}: mean MLE error = {np.mean(mle_errors):.3f}")
     """
     
@@ -179,169 +381,158 @@ def sample_observation_sequences_multiT(
     # CREATE WORLD
     # =========================================================================
     
-    try:
-        world = World(n=n, m=m, theta_values=theta_values)
-    except Exception as e:
-        raise RuntimeError(f"Failed to create World: {e}")
-    
-    # Validate thetas against World's theta_values
-    for theta in thetas:
-        closest = world.theta_values[np.abs(world.theta_values - theta).argmin()]
-        if not np.isclose(theta, closest, rtol=1e-10, atol=1e-10):
-            raise ValueError(
-                f"theta {theta} not in World's theta_values. "
-                f"Closest: {closest}. Available: {list(world.theta_values)}"
-            )
+    if world is None:
+        try:
+            world = World(n=n, m=m, theta_values=theta_values)
+        except Exception as e:
+            raise RuntimeError(f"Failed to create World: {e}")
+    elif (world.n, world.m) != (n, m):
+        raise ValueError(
+            f"Supplied world has (n, m) = ({world.n}, {world.m}), "
+            f"expected ({n}, {m})"
+        )
+    
+    # Validate thetas against World's theta_values (one broadcast for all thetas)
+    thetas_arr = np.asarray(thetas, dtype=float)
+    closest_idx = np.abs(thetas_arr[:, None] - world.theta_values[None, :]).argmin(axis=1)
+    closest = world.theta_values[closest_idx]
+    not_in_grid = ~np.isclose(thetas_arr, closest, rtol=1e-10, atol=1e-10)
+    if np.any(not_in_grid):
+        raise ValueError(
+            f"thetas {thetas_arr[not_in_grid].tolist()} not in World's theta_values. "
+            f"Closest: {closest[not_in_grid].tolist()}. Available: {list(world.theta_values)}"
+        )
     
     # =========================================================================
     # SAMPLE OBSERVATIONS FOR EACH THETA
     # =========================================================================
     
-    observations = {}
-    n_theta_vals = len(world.theta_values)
+    # Each theta is sampled independently, so thetas are distributed across
+    # workers; results come back in the order of thetas
     
-    for theta in thetas:
-        
-        # Sample observation sequences of length max_T
-        try:
-            obs_df = world.sample_multiple_runs(
-                theta=theta,
-                n_run=n_obs_seq,
-                n_round=max_T,
-                base_seed=random_seed
-            )
-        except Exception as e:
-            raise RuntimeError(f"Failed to sample observations for theta={theta}: {e}")
-        
-        # -----------------------------------------------------------------
-        # EXTRACT OBSERVATION SEQUENCES (VECTORIZED VIA GROUPBY)
-        # -----------------------------------------------------------------
-        
-        out = (
-            obs_df
-            .sort_values(["run_id", "round_index"])
-            .groupby("run_id", sort=True)
-            .agg(
-                obs_seq=("observation", list), # Note: source column is "observation"
-                obs_run_seed=("run_seed", "first")  # Note: source column is "run_seed"
-            )
+    def run_theta(theta):
+        return _sample_observations_for_single_theta_multiT(
+            theta=theta,
+            world=world,
+            n_obs_seq=n_obs_seq,
+            max_T=max_T,
+            random_seed=random_seed
         )
+    
+    if n_jobs == 1:
+        results = [run_theta(theta) for theta in thetas]
+    else:
+        results = make_parallel(n_jobs, backend, n_tasks=len(thetas))(
+            delayed(run_theta)(theta) for theta in thetas
+        )
+    
+    # =========================================================================
+    # COMPUTE OBSERVATION LIKELIHOODS FOR ALL THETAS AND Ts
+    # =========================================================================
+    
+    n_thetas = len(thetas)
+    log_lik_true_all = [None] * n_thetas   # per theta: (n_obs_seq, n_Ts)
+    log_lik_all_all = [None] * n_thetas    # per theta: (n_obs_seq, n_Ts, n_theta_vals)
+    mle_all = [None] * n_thetas            # per theta: (n_obs_seq, n_Ts)
+    
+    if compute_obs_likelihood != "none":
         
-        obs_seqs = out["obs_seq"].tolist()
-        obs_run_seeds = out["obs_run_seed"].tolist()
+        n_theta_vals = len(world.theta_values)
         
-        # -----------------------------------------------------------------
-        # BUILD OBSERVATION RECORDS
-        # -----------------------------------------------------------------
+        # T is 1-indexed, so T-1 gives 0-based array index
+        T_indices = np.array(Ts) - 1
         
-        obs_list = [
-            {
-                "obs_idx": obs_idx,
-                "obs_seq": obs_seqs[obs_idx],
-                "obs_run_seed": obs_run_seeds[obs_idx],
-                "theta": theta,
-                "log_lik_true_theta": None,
-                "log_lik_all_theta": None,
-                "mle_theta": None,
-                "utterances": {}
-            }
-            for obs_idx in range(n_obs_seq)
-        ]
+        # Row position of every observation in the likelihood table
+        # (sampling already returns these, so no tuple lookup is needed)
+        # Shape: (n_thetas, n_obs_seq * max_T)
+        row_indices = np.stack(
+            [obs_indices for obs_indices, _ in results]
+        ).reshape(n_thetas, n_obs_seq * max_T)
+        log_lik_table = world.obs_log_likelihood_array
         
-        # -----------------------------------------------------------------
-        # COMPUTE OBSERVATION LIKELIHOODS FOR ALL Ts
-        # -----------------------------------------------------------------
+        # Column index of each true theta (needed for both modes)
+        # Shape: (n_thetas,)
+        theta_col_indices = np.array([
+            np.where(np.isclose(world.theta_values, theta))[0][0]
+            for theta in thetas
+        ])
         
-        if compute_obs_likelihood != "none":
+        if compute_obs_likelihood == "true":
             
-            # Flatten all observations for batch lookup
-            # obs_seqs is List[List[Tuple]], flatten to List[Tuple]
-            # Shape after flatten: (n_obs_seq * max_T,)
-            all_obs_flat = [obs for seq in obs_seqs for obs in seq]
-            all_obs_keys = [tuple(obs) if not isinstance(obs, tuple) else obs 
-                          for obs in all_obs_flat]
+            # Select ONLY the true-theta column for each theta's rows
+            # Shape: (n_thetas, n_obs_seq * max_T)
+            log_probs_true = log_lik_table[row_indices, theta_col_indices[:, None]]
             
-            # Find column index for true theta (needed for both modes)
-            theta_col_idx = np.where(np.isclose(world.theta_values, theta))[0][0]
-            true_theta_val = world.theta_values[theta_col_idx]
+            # Reshape to (n_thetas, n_obs_seq, max_T)
+            log_probs_true = log_probs_true.reshape(n_thetas, n_obs_seq, max_T)
             
-            if compute_obs_likelihood == "true":
-                
-                # Select ONLY the column for true theta
-                # Shape: (n_obs_seq * max_T,)
-                log_probs_flat_true = world.obs_log_likelihood_theta.loc[
-                    all_obs_keys, true_theta_val
-                ].values
-                
-                # Reshape to (n_obs_seq, max_T)
-                log_probs_2d = log_probs_flat_true.reshape(n_obs_seq, max_T)
+            if len(Ts) == 1:
+                # Single T: a plain sum over the first T steps suffices
+                # Shape: (n_thetas, n_obs_seq, 1)
+                log_lik_true_all = log_probs_true[:, :, :Ts[0]].sum(
+                    axis=2, keepdims=True
+                )
+            else:
+                # Cumulative sum over T dimension (axis=2)
+                # cumsum_log_probs_true[k, i, t] = log P(O_0, ..., O_t | thetas[k])
+                cumsum_log_probs_true = np.cumsum(log_probs_true, axis=2)
                 
-                # Cumulative sum over T dimension (axis=1)
-                # cumsum_log_probs[i, t] = log P(O_0, ..., O_t | true_theta)
-                # Shape: (n_obs_seq, max_T)
-                cumsum_log_probs_true = np.cumsum(log_probs_2d, axis=1)
-                
-                # Extract likelihoods for each T (vectorized)
-                # T is 1-indexed, so T-1 gives 0-based array index
-                log_lik_true_all = {
-                    T: cumsum_log_probs_true[:, T - 1] for T in Ts
-                }
-                
-                # Distribute results to observation records
-                for i in range(n_obs_seq):
-                    obs_list[i]["log_lik_true_theta"] = {
-                        T: float(log_lik_true_all[T][i]) for T in Ts
-                    }
-                    # log_lik_all_theta and mle_theta remain None
+                # Extract likelihoods for all Ts
+                # Shape: (n_thetas, n_obs_seq, n_Ts)
+                log_lik_true_all = cumsum_log_probs_true[:, :, T_indices]
+        
+        else:  # compute_obs_likelihood == "all"
             
-            else:  # compute_obs_likelihood == "all"
-                
-                # Load full matrix
-                # Shape: (n_obs_seq * max_T, n_theta_vals)
-                log_probs_flat = world.obs_log_likelihood_theta.loc[all_obs_keys].values
-                
-                # Reshape to (n_obs_seq, max_T, n_theta_vals)
-                log_probs_3d = log_probs_flat.reshape(n_obs_seq, max_T, n_theta_vals)
-                
-                # Cumulative sum over T dimension (axis=1)
-                # cumsum_log_probs[i, t, :] = log P(O_0, ..., O_t | all thetas)
-                # Shape: (n_obs_seq, max_T, n_theta_vals)
-                cumsum_log_probs = np.cumsum(log_probs_3d, axis=1)
-                
-                # Storage for vectorized results
-                log_lik_true_all = {}   # {T: shape (n_obs_seq,)}
-                log_lik_all_all = {}    # {T: shape (n_obs_seq, n_theta_vals)}
-                mle_all = {}            # {T: shape (n_obs_seq,)}
-                
-                for T in Ts:
-                    # Extract likelihoods at position T-1 for all obs_seqs
-                    # Shape: (n_obs_seq, n_theta_vals)
-                    log_liks_at_T = cumsum_log_probs[:, T - 1, :]
-                    
-                    # True theta likelihood
-                    log_lik_true_all[T] = log_liks_at_T[:, theta_col_idx]
-                    
-                    # Full likelihood array
-                    log_lik_all_all[T] = log_liks_at_T
-                    
-                    # MLE theta: argmax across theta dimension
-                    mle_indices = np.argmax(log_liks_at_T, axis=1)
-                    mle_all[T] = world.theta_values[mle_indices]
+            # Load full rows in one gather
+            # Shape: (n_thetas, n_obs_seq, max_T, n_theta_vals)
+            log_probs_4d = log_lik_table[row_indices].reshape(
+                n_thetas, n_obs_seq, max_T, n_theta_vals
+            )
+            
+            if len(Ts) == 1:
+                # Single T: a plain sum over the first T steps suffices
+                # Shape: (n_thetas, n_obs_seq, 1, n_theta_vals)
+                log_lik_all_all = log_probs_4d[:, :, :Ts[0], :].sum(
+                    axis=2, keepdims=True
+                )
+            else:
+                # Cumulative sum over T dimension (axis=2)
+                # cumsum_log_probs[k, i, t, :] = log P(O_0, ..., O_t | all thetas)
+                cumsum_log_probs = np.cumsum(log_probs_4d, axis=2)
                 
-                # Distribute results to observation records
-                for i in range(n_obs_seq):
-                    obs_list[i]["log_lik_true_theta"] = {
-                        T: float(log_lik_true_all[T][i]) for T in Ts
-                    }
-                    obs_list[i]["log_lik_all_theta"] = {
-                        T: log_lik_all_all[T][i].copy() for T in Ts
-                    }
-                    obs_list[i]["mle_theta"] = {
-                        T: float(mle_all[T][i]) for T in Ts
-                    }
-        
-        # Store observations for this theta
-        observations[theta] = obs_list
+                # Extract likelihoods for all Ts
+                # Shape: (n_thetas, n_obs_seq, n_Ts, n_theta_vals)
+                log_lik_all_all = cumsum_log_probs[:, :, T_indices, :]
+            
+            # True theta likelihood
+            # Shape: (n_thetas, n_obs_seq, n_Ts)
+            log_lik_true_all = np.take_along_axis(
+                log_lik_all_all, theta_col_indices[:, None, None, None], axis=3
+            )[..., 0]
+            
+            # MLE theta: argmax across theta dimension
+            # Shape: (n_thetas, n_obs_seq, n_Ts)
+            mle_all = world.theta_values[np.argmax(log_lik_all_all, axis=3)]
+    
+    # =========================================================================
+    # BUILD OBSERVATION RECORDS
+    # =========================================================================
+    
+    # Frequency tuples of every possible observation, one row per table row
+    observation_array = world.observation_array
+    
+    observations = {
+        theta: ObservationRecords(
+            theta=theta,
+            Ts=Ts,
+            obs_seqs=observation_array[obs_indices],
+            obs_run_seeds=obs_run_seeds,
+            log_lik_true=log_lik_true_all[k],
+            log_lik_all=log_lik_all_all[k],
+            mle=mle_all[k]
+        )
+        for k, (theta, (obs_indices, obs_run_seeds)) in enumerate(zip(thetas, results))
+    }
     
     # =========================================================================
     # RETURN RESULT
@@ -364,6 +555,58 @@ def sample_observation_sequences_multiT(
 
 
 
+def _sample_observations_for_single_theta_multiT(
+    theta: float,
+    world: World,
+    n_obs_seq: int,
+    max_T: int,
+    random_seed: Optional[int]
+) -> Tuple[np.ndarray, List[Optional[int]]]:
+    """
+    Sample observation sequences for a single theta, as table row indices.
+    
+    This is the core worker function for observation sampling.
+    
+    Parameters
+    ----------
+    theta : float
+        The true theta value (must be in world.theta_values).
+    world : World
+        The World object used for sampling.
+    n_obs_seq : int
+        Number of observation sequences to sample.
+    max_T : int
+        Length of each sampled observation sequence.
+    random_seed : Optional[int]
+        Base random seed passed to world.sample_run_indices().
+    
+    Returns
+    -------
+    Tuple[np.ndarray, List[Optional[int]]]
+        (obs_indices, obs_run_seeds): obs_indices is an integer array of
+        shape (n_obs_seq, max_T) holding row positions in
+        world.obs_log_likelihood_theta (not frequency tuples; index
+        world.observation_array to recover those); both are ordered by run_id.
+    
+    Raises
+    ------
+    RuntimeError
+        If observation sampling fails.
+    """
+    
+    # Same draws as world.sample_multiple_runs(), kept as table row indices
+    try:
+        return world.sample_run_indices(
+            theta=theta,
+            n_run=n_obs_seq,
+            n_round=max_T,
+            base_seed=random_seed
+        )
+    except Exception as e:
+        raise RuntimeError(f"Failed to sample observations for theta={theta}: {e}")
+
+
+
 # =============================================================================
 # STAGE 2: UTTERANCE GENERATION
 # =============================================================================
@@ -373,8 +616,9 @@ def generate_utterances_for_observations_multiT(
     speaker_config: Dict[str, Any],
     n_utt_seq: int,
     n_jobs: int = 1,
-    backend: str = "loky",
-    verbose: int = 0
+    backend: str = "threading",
+    verbose: int = 0,
+    thetas: Optional[List[float]] = None
 ) -> None:
     """
     Generate utterance sequences for pre-sampled observations (in-place).
@@ -392,10 +636,15 @@ def generate_utterances_for_observations_multiT(
         Must be <= 10000 to avoid seed collisions.
     n_jobs : int, default 1
         Number of parallel jobs (-1 for all cores).
-    backend : str, default "loky"
-        Joblib backend.
+    backend : str, default "threading"
+        Joblib backend. Each task samples from its own np.random.Generator,
+        so threads are safe and avoid pickling the World for every task.
     verbose : int, default 0
         Verbosity level.
+    thetas : Optional[List[float]], default None
+        Generate only for these thetas of obs_data["config"]["thetas"]
+        (default: all). Seeds are still numbered over all config thetas, so
+        each theta gets the same utterances whichever subset is generated.
     
     Returns
     -------
@@ -427,9 +676,14 @@ def generate_utterances_for_observations_multiT(
     world = obs_data["world"]
     config = obs_data["config"]
     Ts = config["Ts"]
-    thetas = config["thetas"]
+    config_thetas = config["thetas"]
     random_seed = config["random_seed"]
     
+    if thetas is None:
+        thetas = config_thetas
+    if not thetas:
+        return
+    
     # DETERMINE SPEAKER KEY AND ALPHA KEY
     
     speaker_type = speaker_config["speaker_type"]
@@ -468,19 +722,25 @@ def generate_utterances_for_observations_multiT(
     
     # BUILD TASK LIST
     
+    # Seeds are assigned by task index over all config thetas, before
+    # keeping only the requested ones
     tasks = []
-    for theta in thetas:
-        for obs_info in obs_data["observations"][theta]:
+    task_idx = 0
+    selected = set(thetas)
+    for theta in config_thetas:
+        observations = obs_data["observations"][theta]
+        if theta not in selected:
+            task_idx += len(observations)
+            continue
+        for obs_info in observations:
             tasks.append({
                 "theta": theta,
                 "obs_idx": obs_info["obs_idx"],
-                "obs_seq": obs_info["obs_seq"]
+                "obs_seq": obs_info["obs_seq"],
+                "base_seed": (random_seed + task_idx * 10_000
+                              if random_seed is not None else None)
             })
-    
-    # Assign seeds based on task index
-    for task_idx, task in enumerate(tasks):
-        task["base_seed"] = (random_seed + task_idx * 10_000 
-                            if random_seed is not None else None)
+            task_idx += 1
     
     # VERBOSE OUTPUT
     
@@ -504,10 +764,12 @@ def generate_utterances_for_observations_multiT(
             base_seed=task["base_seed"]
         )
     
+    # With process backends, joblib memmaps the World's large arrays
+    # (above its 1 MB max_nbytes default) instead of copying them per worker
     if n_jobs == 1:
         results = [run_task(task) for task in tasks]
     else:
-        results = Parallel(n_jobs=n_jobs, backend=backend, verbose=verbose)(
+        results = make_parallel(n_jobs, backend, n_tasks=len(tasks), verbose=verbose)(
             delayed(run_task)(task) for task in tasks
         )
     
@@ -538,14 +800,15 @@ def _generate_utterances_for_single_obs_seq_multiT(
     """
     Generate utterance sequences for a single observation sequence.
     
-    This is the core worker function for utterance generation. It creates a 
+    This is the core worker function for utterance generation. It uses a 
     fresh speaker for each utterance sequence and computes cumulative 
     log-likelihoods for each T in Ts.
     
     Parameters
     ----------
     obs_seq : List[Tuple[int, ...]]
-        The observation sequence (length max_T).
+        The observation sequence (length max_T). Observations must be tuples,
+        as produced by sample_observation_sequences_multiT().
     world : World
         The World object (used to create speaker instances).
     speaker_config : Dict[str, Any]
@@ -577,8 +840,11 @@ def _generate_utterances_for_single_obs_seq_multiT(
             The generated utterance sequence (same length as obs_seq)
         - utt_seed: Optional[int]
             The random seed used (for reproducibility)
-        - log_lik_true_speaker: Dict[int, float]
-            {T: log P(utt[:T] | obs[:T], speaker)} for each T in Ts
+        - log_lik_true_speaker: np.ndarray
+            Shape (len(Ts),); entry t_idx is log P(utt[:T] | obs[:T], speaker)
+            for T = Ts[t_idx] (Ts as given, i.e. obs_data["config"]["Ts"]).
+            Files written by run_coarse_screening.save_results hold it as
+            {T: float}.
         - log_lik_all_speaker: None
             Placeholder for later analysis
     
@@ -590,7 +856,10 @@ def _generate_utterances_for_single_obs_seq_multiT(
     Notes
     -----
     - A fresh speaker is created for each utterance sequence to ensure
-      independence (speakers have internal state that evolves).
+      independence (speakers have internal state that evolves). Literal
+      speakers and pragmatic speakers with update_internal=False keep a
+      fixed utterance table, so a single instance is built and its belief
+      reset between sequences instead.
     
     - For pragmatic speakers with update_internal=True, the probability
       table changes after each utterance. We capture log P(u_t | O_t)
@@ -622,7 +891,7 @@ def _generate_utterances_for_single_obs_seq_multiT(
     >>> len(records)
     3
     >>> records[0]["log_lik_true_speaker"]
-    {2: -1.85, 4: -3.72}
+    array([-1.85, -3.72])
     """
     
     # VALIDATE Ts AGAINST SEQUENCE LENGTH
@@ -638,70 +907,82 @@ def _generate_utterances_for_single_obs_seq_multiT(
             f"Invalid values: {invalid_Ts}"
         )
     
+    # T is 1-indexed, array is 0-indexed
+    # Note: Ts validation above ensures T >= 1, so T-1 >= 0
+    T_indices = np.asarray(Ts) - 1
+    
     # GENERATE UTTERANCES
     
     utt_records = []
     is_literal = speaker_config["speaker_type"] == "literal"
     
+    def make_speaker():
+        if is_literal:
+            return LiteralSpeaker(
+                world=world,
+                initial_beliefs_theta=speaker_config.get("initial_beliefs_theta"),
+                
+            )
+        return PragmaticSpeaker_obs(
+            world=world,
+            omega=speaker_config["omega"],
+            psi=speaker_config["psi"],
+            update_internal=speaker_config["update_internal"],
+            alpha=speaker_config["alpha"],
+            beta=speaker_config.get("beta", 0.0),
+            initial_beliefs_theta=speaker_config.get("initial_beliefs_theta")
+        )
+    
+    # A literal speaker, or a pragmatic one with update_internal=False, never
+    # changes its utterance table, so one instance serves every sequence.
+    # Only its (literal) belief evolves; it is reset before each sequence.
+    reuse_speaker = is_literal or not speaker_config["update_internal"]
+    if reuse_speaker:
+        speaker = make_speaker()
+        belief_holder = speaker if is_literal else speaker.literal_speaker
+        initial_log_belief = belief_holder.un_current_log_belief
+    
     for utt_idx in range(n_utt_seq):
         
         # SEED MANAGEMENT
         utt_seed = (base_seed + utt_idx) if base_seed is not None else None
         
-        if utt_seed is not None:
-            np.random.seed(utt_seed)
+        # Per-sequence generator (unseeded if utt_seed is None); never touches
+        # the global np.random state, so tasks can run in threads
+        rng = np.random.default_rng(utt_seed)
         
-        # CREATE FRESH SPEAKER
-        if is_literal:
-            speaker = LiteralSpeaker(
-                world=world,
-                initial_beliefs_theta=speaker_config.get("initial_beliefs_theta"),
-                
-            )
+        # FRESH (OR RESET) SPEAKER
+        if reuse_speaker:
+            belief_holder.un_current_log_belief = initial_log_belief
         else:
-            speaker = PragmaticSpeaker_obs(
-                world=world,
-                omega=speaker_config["omega"],
-                psi=speaker_config["psi"],
-                update_internal=speaker_config["update_internal"],
-                alpha=speaker_config["alpha"],
-                beta=speaker_config.get("beta", 0.0),
-                initial_beliefs_theta=speaker_config.get("initial_beliefs_theta")
-            )
+            speaker = make_speaker()
         
         # GENERATE UTTERANCES WITH PER-STEP LOG PROBABILITIES
-        utt_seq = []
-        log_probs_per_step = []
+        # (buffers preallocated to the known sequence length)
+        utt_seq = [None] * max_T
+        log_probs_array = np.empty(max_T, dtype=np.float64)
         
-        for obs in obs_seq:
-            obs_key = tuple(obs) if not isinstance(obs, tuple) else obs
-            
+        for t, obs_key in enumerate(obs_seq):
             # Capture log probs BEFORE speaking (for update_internal=True)
-            log_probs_for_obs = speaker.utterance_log_prob_obs[obs_key].copy()
+            # An updating speaker replaces its table rather than modifying it,
+            # so the cached array stays valid without a copy
+            log_probs_for_obs = speaker.utterance_log_prob_array(obs_key)
             
             # Generate utterance
-            utt = speaker.update_and_speak(obs)
-            utt_seq.append(utt)
+            utt = speaker.update_and_speak(obs_key, rng=rng)
+            utt_seq[t] = utt
             
             # Look up log probability of chosen utterance
-            log_p = float(log_probs_for_obs.loc[utt])
-            
-            # Handle impossible utterances
-            if not np.isfinite(log_p):
-                log_p = -np.inf
-            
-            log_probs_per_step.append(log_p)
+            log_probs_array[t] = log_probs_for_obs[speaker._utt_index[utt]]
+        
+        # Handle impossible utterances
+        log_probs_array[~np.isfinite(log_probs_array)] = -np.inf
         
         # COMPUTE CUMULATIVE LOG-LIKELIHOODS FOR EACH T
-        log_probs_array = np.array(log_probs_per_step)
         cumsum_log_probs = np.cumsum(log_probs_array)
         
-        # Extract for each T (T is 1-indexed, array is 0-indexed)
-        # Note: Ts validation above ensures T >= 1, so T-1 >= 0
-        log_lik_true_speaker = {
-            T: float(cumsum_log_probs[T - 1])
-            for T in Ts
-        }
+        # Extract for all Ts at once (aligned with Ts)
+        log_lik_true_speaker = cumsum_log_probs[T_indices]
         
         # STORE RECORD
         utt_records.append({
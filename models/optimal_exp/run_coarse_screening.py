@@ -12,6 +12,8 @@ For cluster submission, you can run one (N, M) pair per job:
     python run_coarse_screening.py --n 4 --m 5 --output results_4_5.pkl
     python run_coarse_screening.py --n 4 --m 6 --output results_4_6.pkl
     ...
+
+Large grids can be written per theta with --shard (see load_sharded_results).
 """
 
 import argparse
@@ -22,16 +24,18 @@ import sys
 from datetime import datetime
 
 import numpy as np
+import joblib
+from joblib import Parallel, delayed, effective_n_jobs
 
 from rsa_optimal_exp_sampling_fun import (
+    ObservationRecords,
     sample_observation_sequences_multiT, 
     generate_utterances_for_observations_multiT
 )
 
 from rsa_optimal_exp_fitting import (
     compute_literal_log_likelihood_multiT, 
-    compute_pragmatic_static_log_likelihood_multiT,
-    compute_pragmatic_dynamic_log_likelihood_multiT
+    compute_pragmatic_log_likelihood_multi_psi
 )
 
 
@@ -120,11 +124,21 @@ def run_coarse_screening(
     n_utt_seq: int = DEFAULT_N_UTT_SEQ,
     seed: int = DEFAULT_SEED,
     n_jobs: int = -1,
-    verbose: int = 1
+    verbose: int = 1,
+    shard_dir: str = None,
+    shard_writer=None
 ) -> dict:
     """
     Run the complete coarse screening pipeline for a given (N, M) combination.
     
+    By default every stage runs on the full obs_data, which is returned with
+    all samples and fits in memory. With shard_dir set, Stages 3-4 run one
+    theta at a time instead: each finished theta is written to its own shard
+    file and dropped from memory, so peak memory no longer grows with the
+    fitted results of the whole grid. Thetas whose shard already exists skip
+    Stages 2-4, which lets an interrupted run resume (Stage 1 still samples
+    every theta; it is cheap and seeds each theta independently).
+    
     Parameters
     ----------
     n : int
@@ -145,11 +159,20 @@ def run_coarse_screening(
         Number of parallel workers. -1 for all cores.
     verbose : int
         Verbosity level (0=silent, 1=progress, 2+=detailed).
+    shard_dir : str, optional
+        Directory for per-theta shards (see load_sharded_results). If None,
+        nothing is written and the full obs_data is returned.
+    shard_writer : callable, optional
+        shard_writer(shard, path) used to save each shard. Default: plain
+        pickle (save_results).
     
     Returns
     -------
     dict
         The complete obs_data structure with all samples and fitted likelihoods.
+        Its "config" also records n_utt_seq and the speaker configurations
+        (true_speaker_configs, fitting_speaker_psis). With shard_dir, "observations" is empty and "shards" maps each theta
+        to its shard file name.
     """
     
     if thetas is None:
@@ -157,7 +180,7 @@ def run_coarse_screening(
     if Ts is None:
         Ts = DEFAULT_Ts
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     # =========================================================================
     # STAGE 1: Sample observation sequences
@@ -173,7 +196,7 @@ def run_coarse_screening(
         print("=" * 70)
         print("\n[Stage 1] Sampling observation sequences...")
     
-    stage1_start = time.time()
+    stage1_start_ns = time.perf_counter_ns()
     
     obs_data = sample_observation_sequences_multiT(
         n=n, 
@@ -182,14 +205,33 @@ def run_coarse_screening(
         Ts=Ts,
         n_obs_seq=n_obs_seq,
         random_seed=seed,
-        compute_obs_likelihood="all"
+        compute_obs_likelihood="all",
+        n_jobs=n_jobs
     )
     
-    stage1_time = time.time() - stage1_start
+    # Record the Stage 2-4 settings too, so the saved config (and the shard
+    # resume check) describes the whole run
+    obs_data["config"].update(
+        n_utt_seq=n_utt_seq,
+        true_speaker_configs=[dict(config) for config in TRUE_SPEAKER_CONFIGS],
+        fitting_speaker_psis=list(FITTING_SPEAKER_PSIS)
+    )
+    
+    stage1_time = _seconds_since(stage1_start_ns)
     if verbose >= 1:
         n_total_obs = len(thetas) * n_obs_seq
         print(f"  Completed: {n_total_obs} observation sequences in {stage1_time:.1f}s")
     
+    # Resuming a sharded run: only thetas without a shard go through Stages 2-4
+    pending_thetas = list(thetas)
+    if shard_dir is not None:
+        os.makedirs(shard_dir, exist_ok=True)
+        _check_shard_config(shard_dir, obs_data["config"])
+        pending_thetas = [
+            theta for theta in thetas
+            if not os.path.exists(os.path.join(shard_dir, _shard_file_name(theta)))
+        ]
+    
     # =========================================================================
     # STAGE 2: Generate utterances from each speaker model
     # =========================================================================
@@ -197,86 +239,117 @@ def run_coarse_screening(
     if verbose >= 1:
         print("\n[Stage 2] Generating utterances from each speaker model...")
     
-    stage2_start = time.time()
-    
-    for i, speaker_config in enumerate(TRUE_SPEAKER_CONFIGS):
-        speaker_name = _get_speaker_name(speaker_config)
-        
-        if verbose >= 2:
-            print(f"  Generating from {speaker_name}...")
-        
-        generate_utterances_for_observations_multiT(
-            obs_data=obs_data,
-            speaker_config=speaker_config,
-            n_utt_seq=n_utt_seq,
-            n_jobs=n_jobs,
-            verbose=max(0, verbose - 2)
+    stage2_start_ns = time.perf_counter_ns()
+    
+    # Speaker configs are independent: run them in an outer pool and give
+    # each one an equal share of the remaining workers for its obs_seqs
+    n_workers = effective_n_jobs(n_jobs)
+    n_outer = min(len(TRUE_SPEAKER_CONFIGS), n_workers)
+    n_inner = max(1, n_workers // n_outer)
+    
+    if verbose >= 2:
+        for speaker_config in TRUE_SPEAKER_CONFIGS:
+            print(f"  Generating from {_get_speaker_name(speaker_config)}...")
+    
+    if n_outer == 1:
+        for speaker_config in TRUE_SPEAKER_CONFIGS:
+            generate_utterances_for_observations_multiT(
+                obs_data=obs_data,
+                speaker_config=speaker_config,
+                n_utt_seq=n_utt_seq,
+                n_jobs=n_inner,
+                verbose=max(0, verbose - 2),
+                thetas=pending_thetas
+            )
+    else:
+        # Workers get only what Stage 2 reads (World, config and each theta's
+        # obs_seqs), fill their own copy and return only the new utterances,
+        # which are merged here
+        stage2_data = {
+            "world": obs_data["world"],
+            "config": obs_data["config"],
+            "observations": {
+                theta: ObservationRecords(
+                    theta=records.theta,
+                    Ts=records.Ts,
+                    obs_seqs=records.obs_seqs,
+                    obs_run_seeds=records.obs_run_seeds
+                )
+                for theta, records in obs_data["observations"].items()
+            }
+        }
+        speaker_results = Parallel(n_jobs=n_outer, backend="loky")(
+            delayed(_generate_speaker_utterances)(
+                obs_data=stage2_data,
+                speaker_config=speaker_config,
+                n_utt_seq=n_utt_seq,
+                n_jobs=n_inner,
+                verbose=max(0, verbose - 2),
+                thetas=pending_thetas
+            )
+            for speaker_config in TRUE_SPEAKER_CONFIGS
         )
+        
+        for speaker_config, utterances in zip(TRUE_SPEAKER_CONFIGS, speaker_results):
+            speaker_name = _get_speaker_name(speaker_config)
+            for theta, obs_utterances in utterances.items():
+                for obs_info, utt_by_alpha in zip(obs_data["observations"][theta], obs_utterances):
+                    obs_info["utterances"].setdefault(speaker_name, {}).update(utt_by_alpha)
     
-    stage2_time = time.time() - stage2_start
+    stage2_time = _seconds_since(stage2_start_ns)
     if verbose >= 1:
-        n_total_utt = len(thetas) * n_obs_seq * n_utt_seq * len(TRUE_SPEAKER_CONFIGS)
+        n_total_utt = len(pending_thetas) * n_obs_seq * n_utt_seq * len(TRUE_SPEAKER_CONFIGS)
         print(f"  Completed: {n_total_utt} utterance sequences in {stage2_time:.1f}s")
     
     # =========================================================================
-    # STAGE 3: Fit literal speaker
-    # =========================================================================
-    
-    if verbose >= 1:
-        print("\n[Stage 3] Fitting literal speaker...")
-    
-    stage3_start = time.time()
-    
-    compute_literal_log_likelihood_multiT(
-        obs_data=obs_data,
-        verbose=max(0, verbose - 1)
-    )
-    
-    stage3_time = time.time() - stage3_start
-    if verbose >= 1:
-        print(f"  Completed in {stage3_time:.1f}s")
-    
-    # =========================================================================
-    # STAGE 4: Fit pragmatic speakers (static and dynamic)
+    # STAGES 3-4: Fit literal and pragmatic speakers
     # =========================================================================
     
-    if verbose >= 1:
-        print("\n[Stage 4] Fitting pragmatic speakers...")
-    
-    stage4_start = time.time()
-    
-    for psi in FITTING_SPEAKER_PSIS:
-        psi_name = {"inf": "informative", "pers+": "persuade-up", "pers-": "persuade-down"}[psi]
-        
-        if verbose >= 2:
-            print(f"  Fitting {psi_name} (static)...")
-        
-        compute_pragmatic_static_log_likelihood_multiT(
-            obs_data=obs_data,
-            fitting_psi=psi,
-            n_jobs=n_jobs,
-            verbose=max(0, verbose - 2)
-        )
+    if shard_dir is None:
+        stage3_time, stage4_time = _fit_speakers(obs_data, n_jobs, verbose)
+    else:
+        if shard_writer is None:
+            shard_writer = save_results
         
-        if verbose >= 2:
-            print(f"  Fitting {psi_name} (dynamic)...")
+        stage3_time = stage4_time = 0.0
+        shards = {}
+        for theta in thetas:
+            shard_name = _shard_file_name(theta)
+            shard_path = os.path.join(shard_dir, shard_name)
+            shards[theta] = shard_name
+            
+            # Take this theta out of obs_data; once its shard is written
+            # nothing else holds a reference to it
+            theta_data = {
+                "world": obs_data["world"],
+                "config": {**obs_data["config"], "thetas": [theta]},
+                "observations": {theta: obs_data["observations"].pop(theta)}
+            }
+            
+            if theta not in pending_thetas:
+                if verbose >= 1:
+                    print(f"\n[theta={theta}] Shard exists, skipping: {shard_path}")
+                continue
+            
+            if verbose >= 1:
+                print(f"\n[theta={theta}]")
+            theta_stage3, theta_stage4 = _fit_speakers(theta_data, n_jobs, verbose)
+            stage3_time += theta_stage3
+            stage4_time += theta_stage4
+            
+            shard_writer(
+                {"theta": theta, "observations": theta_data["observations"][theta]},
+                shard_path
+            )
+            del theta_data
         
-        compute_pragmatic_dynamic_log_likelihood_multiT(
-            obs_data=obs_data,
-            fitting_psi=psi,
-            n_jobs=n_jobs,
-            verbose=max(0, verbose - 2)
-        )
-    
-    stage4_time = time.time() - stage4_start
-    if verbose >= 1:
-        print(f"  Completed in {stage4_time:.1f}s")
+        obs_data["shards"] = shards
     
     # =========================================================================
     # SUMMARY
     # =========================================================================
     
-    total_time = time.time() - start_time
+    total_time = _seconds_since(start_ns)
     
     if verbose >= 1:
         print("\n" + "=" * 70)
@@ -312,6 +385,258 @@ def run_coarse_screening(
     return obs_data
 
 
+def _seconds_since(start_ns: int) -> float:
+    """Seconds elapsed since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+
+def _fit_speakers(obs_data: dict, n_jobs: int, verbose: int) -> tuple:
+    """
+    Run Stage 3 (literal fit) and Stage 4 (pragmatic fits) on obs_data in
+    place and return their wall-clock times (stage3_time, stage4_time).
+    """
+    
+    # =========================================================================
+    # STAGE 3: Fit literal speaker
+    # =========================================================================
+    
+    if verbose >= 1:
+        print("\n[Stage 3] Fitting literal speaker...")
+    
+    stage3_start_ns = time.perf_counter_ns()
+    
+    compute_literal_log_likelihood_multiT(
+        obs_data=obs_data,
+        verbose=max(0, verbose - 1)
+    )
+    
+    stage3_time = _seconds_since(stage3_start_ns)
+    if verbose >= 1:
+        print(f"  Completed in {stage3_time:.1f}s")
+    
+    # =========================================================================
+    # STAGE 4: Fit pragmatic speakers (static and dynamic)
+    # =========================================================================
+    
+    if verbose >= 1:
+        print("\n[Stage 4] Fitting pragmatic speakers...")
+    
+    stage4_start_ns = time.perf_counter_ns()
+    
+    # All psis, static and dynamic, in one pass sharing the listener walks
+    compute_pragmatic_log_likelihood_multi_psi(
+        obs_data=obs_data,
+        psis=tuple(FITTING_SPEAKER_PSIS),
+        modes=("static", "dynamic"),
+        n_jobs=n_jobs,
+        verbose=max(0, verbose - 1)
+    )
+    
+    stage4_time = _seconds_since(stage4_start_ns)
+    if verbose >= 1:
+        print(f"  Completed in {stage4_time:.1f}s")
+    
+    return stage3_time, stage4_time
+
+
+def _generate_speaker_utterances(
+    obs_data: dict,
+    speaker_config: dict,
+    n_utt_seq: int,
+    n_jobs: int,
+    verbose: int,
+    thetas: list
+) -> dict:
+    """
+    Run Stage 2 for one speaker and the given thetas on a (worker-local)
+    obs_data and return the generated utterances as
+    {theta: [{alpha_key: utt_records}, ...]}, one entry per obs_seq in order.
+    """
+    generate_utterances_for_observations_multiT(
+        obs_data=obs_data,
+        speaker_config=speaker_config,
+        n_utt_seq=n_utt_seq,
+        n_jobs=n_jobs,
+        verbose=verbose,
+        thetas=thetas
+    )
+    speaker_name = _get_speaker_name(speaker_config)
+    return {
+        theta: [
+            obs_info["utterances"][speaker_name]
+            for obs_info in obs_data["observations"][theta]
+        ]
+        for theta in thetas
+    }
+
+
+def _downcast_log_likelihoods(obs_data: dict) -> None:
+    """
+    Store the log-likelihood arrays of obs_data as float32 (in place).
+    
+    Covers the Stage 1 observation log-likelihoods (log_lik_true, log_lik_all).
+    Values are log-scale (bounded well within float32 range) and -inf is
+    preserved. MLE thetas, each utterance record's log_lik_true_speaker
+    (saved as {T: float}) and the fitted results (Python floats) are left
+    unchanged.
+    """
+    for records in obs_data["observations"].values():
+        if records.log_lik_true is not None:
+            records.log_lik_true = records.log_lik_true.astype(np.float32)
+        if records.log_lik_all is not None:
+            records.log_lik_all = records.log_lik_all.astype(np.float32)
+
+
+# =============================================================================
+# OUTPUT FILES
+# =============================================================================
+
+SHARD_INDEX_FILE = "index.pkl"
+
+
+def save_results(obj, path: str, compress: str = "none", compress_level: int = 3) -> None:
+    """
+    Save obj to path as a plain pickle, or through joblib when compress is
+    "zlib" or "lz4" (read those back with joblib.load).
+    
+    obj may be obs_data or a shard; its observations are written in the
+    saved layout (see _to_saved_layout), obj itself is not modified.
+    
+    The file is written under a per-process temp name and renamed into
+    place, so an interrupted save never leaves a truncated file at path
+    (shard resume treats any existing shard as complete).
+    """
+    obj = _to_saved_layout(obj)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if compress == "none":
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        # joblib writes numpy arrays as raw buffers and compresses the stream;
+        # "lz4" needs the lz4 package installed
+        joblib.dump(
+            obj, tmp_path,
+            compress=(compress, compress_level),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+    os.replace(tmp_path, path)
+
+
+def _to_saved_layout(obj):
+    """
+    Return obj with its observations converted to the on-disk schema.
+    
+    In memory each theta's observations are an ObservationRecords and each
+    utterance record keeps log_lik_true_speaker as an array aligned with Ts.
+    Saved files hold plain lists of per-observation dicts and
+    log_lik_true_speaker as {T: float}, which is what the analysis notebooks
+    read and loads without this package. Handles obs_data ("observations"
+    maps theta to records) and shards ("observations" is one theta's
+    records). Objects without observations are returned unchanged.
+    """
+    if not isinstance(obj, dict) or "observations" not in obj:
+        return obj
+    
+    observations = obj["observations"]
+    if isinstance(observations, dict):
+        observations = {
+            theta: _saved_records(records) for theta, records in observations.items()
+        }
+    else:
+        observations = _saved_records(observations)
+    return {**obj, "observations": observations}
+
+
+def _saved_records(records) -> list:
+    """
+    One theta's observations as plain dicts, with log_lik_true_speaker as
+    {T: float}. Already-saved lists (e.g. reloaded results) pass through.
+    """
+    if not hasattr(records, "to_list"):
+        return records
+    return [
+        {**obs_info, "utterances": _saved_utterances(obs_info["utterances"], records.Ts)}
+        for obs_info in records.to_list()
+    ]
+
+
+def _saved_utterances(obs_utterances, Ts):
+    """Copy of one observation's utterances with log_lik_true_speaker as {T: float}."""
+    return {
+        speaker_key: {
+            alpha_key: [
+                {
+                    **utt_rec,
+                    "log_lik_true_speaker": dict(zip(
+                        Ts, np.asarray(utt_rec["log_lik_true_speaker"], dtype=float).tolist()
+                    ))
+                }
+                for utt_rec in utt_records
+            ]
+            for alpha_key, utt_records in utt_by_alpha.items()
+        }
+        for speaker_key, utt_by_alpha in obs_utterances.items()
+    }
+
+
+def load_sharded_results(shard_dir: str) -> dict:
+    """
+    Reassemble the obs_data of a sharded run (run_coarse_screening with
+    shard_dir, or --shard on the command line).
+    
+    Parameters
+    ----------
+    shard_dir : str
+        Directory holding index.pkl and one theta_<theta>.pkl per theta.
+    
+    Returns
+    -------
+    dict
+        obs_data in the same layout as an unsharded run.
+    """
+    # joblib.load reads both plain and compressed pickles
+    obs_data = joblib.load(os.path.join(shard_dir, SHARD_INDEX_FILE))
+    shards = obs_data.pop("shards", None)
+    if shards is None:
+        raise ValueError(
+            f"{shard_dir} has no completed index; the run did not finish"
+        )
+    
+    obs_data["observations"] = {}
+    for theta in obs_data["config"]["thetas"]:
+        shard = joblib.load(os.path.join(shard_dir, shards[theta]))
+        obs_data["observations"][theta] = shard["observations"]
+    
+    return obs_data
+
+
+def _shard_file_name(theta: float) -> str:
+    """File name of the shard holding one theta."""
+    return f"theta_{theta}.pkl"
+
+
+def _check_shard_config(shard_dir: str, config: dict) -> None:
+    """
+    Record config in the shard index, or, when resuming into an existing
+    shard_dir, check that its shards were produced with the same config.
+    
+    config is obs_data["config"]: the Stage 1 settings plus n_utt_seq and
+    the generating and fitting speaker configurations.
+    """
+    index_path = os.path.join(shard_dir, SHARD_INDEX_FILE)
+    if os.path.exists(index_path):
+        existing_config = joblib.load(index_path)["config"]
+        if existing_config != config:
+            raise ValueError(
+                f"{shard_dir} holds shards from a different configuration:\n"
+                f"  existing: {existing_config}\n"
+                f"  current:  {config}\n"
+                f"Use a new directory or remove the old shards."
+            )
+    else:
+        save_results({"config": config}, index_path)
+
+
 def _get_speaker_name(config: dict) -> str:
     """Get a human-readable name for a speaker configuration."""
     if config["speaker_type"] == "literal":
@@ -341,6 +666,13 @@ Examples:
 
   # Run quietly
   python run_coarse_screening.py --n 5 --m 4 --output results_5_4.pkl --verbose 0
+
+  # Write a compressed file (load with joblib.load)
+  python run_coarse_screening.py --n 5 --m 5 --output results_5_5.pkl --compress zlib
+
+  # Write one shard per theta into a directory (resumable; load with
+  # load_sharded_results)
+  python run_coarse_screening.py --n 5 --m 5 --output results_5_5 --shard
         """
     )
     
@@ -363,9 +695,26 @@ Examples:
                         help="Number of parallel workers (-1 for all cores)")
     parser.add_argument("--verbose", type=int, default=1,
                         help="Verbosity level (0=silent, 1=progress, 2+=detailed)")
+    parser.add_argument("--float32", action="store_true",
+                        help="Store log-likelihood arrays as float32 to halve their size")
+    parser.add_argument("--compress", type=str, default="none",
+                        choices=["none", "zlib", "lz4"],
+                        help="Compress the output with joblib (read it back with "
+                             "joblib.load); 'none' writes a plain pickle (default: none)")
+    parser.add_argument("--compress_level", type=int, default=3,
+                        help="Compression level for --compress (default: 3)")
+    parser.add_argument("--shard", action="store_true",
+                        help="Treat --output as a directory and write each theta's "
+                             "fitted results there as soon as they are done; existing "
+                             "shards are skipped on rerun")
     
     args = parser.parse_args()
     
+    def write_shard(shard, path):
+        if args.float32:
+            _downcast_log_likelihoods({"observations": {shard["theta"]: shard["observations"]}})
+        save_results(shard, path, args.compress, args.compress_level)
+    
     # Run the pipeline
     obs_data = run_coarse_screening(
         n=args.n,
@@ -374,19 +723,32 @@ Examples:
         n_utt_seq=args.n_utt_seq,
         seed=args.seed,
         n_jobs=args.n_jobs,
-        verbose=args.verbose
+        verbose=args.verbose,
+        shard_dir=args.output if args.shard else None,
+        shard_writer=write_shard
     )
     
     # Save results
-    output_path = args.output
-    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-    
-    with open(output_path, "wb") as f:
-        pickle.dump(obs_data, f)
+    if args.shard:
+        # The shards are already on disk; completing the index marks the run done
+        output_path = os.path.join(args.output, SHARD_INDEX_FILE)
+        save_results(obs_data, output_path, args.compress, args.compress_level)
+        saved_paths = [output_path] + [
+            os.path.join(args.output, name) for name in obs_data["shards"].values()
+        ]
+    else:
+        if args.float32:
+            _downcast_log_likelihoods(obs_data)
+        
+        output_path = args.output
+        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        
+        save_results(obs_data, output_path, args.compress, args.compress_level)
+        saved_paths = [output_path]
     
     if args.verbose >= 1:
-        file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
-        print(f"\nSaved results to: {output_path} ({file_size_mb:.1f} MB)")
+        file_size_mb = sum(os.path.getsize(path) for path in saved_paths) / (1024 * 1024)
+        print(f"\nSaved results to: {args.output} ({file_size_mb:.1f} MB)")
 
 
 if __name__ == "__main__":
@@ -10,11 +10,14 @@ This version downloads emoji images from Twemoji CDN - works on ALL platforms!
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 from typing import Tuple, List, Optional, Dict
-import itertools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import functools
 import os
 import urllib.request
 import io
 
+import numpy as np
+
 
 # Emoji Unicode code points for Twemoji URLs
 EMOJI_CONFIG = {
@@ -35,6 +38,10 @@ EMOJI_CONFIG = {
 # Twemoji CDN URL template (72x72 PNG)
 TWEMOJI_URL = "https://cdn.jsdelivr.net/gh/twitter/twemoji@latest/assets/72x72/{codepoint}.png"
 
+# PNG deflate level for saved stimuli: 1 saves about twice as fast as
+# PIL's default (6) for files roughly a fifth larger
+PNG_COMPRESS_LEVEL = 1
+
 
 def get_cache_dir() -> Path:
     """Get or create the emoji cache directory."""
@@ -77,6 +84,9 @@ def load_emoji_images(size: int = 60) -> Dict[str, Image.Image]:
     """
     Download and load all required emoji images.
     
+    Results are cached per size, so repeated calls (e.g. create_stimuli_image
+    without emoji_images) reuse the decoded images. Treat them as read-only.
+    
     Parameters
     ----------
     size : int
@@ -87,19 +97,34 @@ def load_emoji_images(size: int = 60) -> Dict[str, Image.Image]:
     Dict[str, Image.Image]
         Dictionary mapping emoji names to PIL Images
     """
+    # Positional call so size=60 and 60 share one cache entry
+    return _load_emoji_images_cached(size)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_emoji_images_cached(size: int) -> Dict[str, Image.Image]:
+    """Cached body of load_emoji_images."""
     cache_dir = get_cache_dir()
     emojis = {}
     
     print("Loading emoji images...")
+    
+    # Fetch missing PNGs concurrently (cached ones return immediately)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            name: executor.submit(download_emoji, config["codepoint"], cache_dir)
+            for name, config in EMOJI_CONFIG.items()
+        }
+    
     for name, config in EMOJI_CONFIG.items():
         print(f"  {config['char']} ({name})...", end=" ")
         
-        # Download if needed
-        png_path = download_emoji(config["codepoint"], cache_dir)
+        png_path = futures[name].result()
         
         # Load and resize
         img = Image.open(png_path).convert("RGBA")
-        img = img.resize((size, size), Image.Resampling.LANCZOS)
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
         
         emojis[name] = img
         print("✓")
@@ -185,14 +210,9 @@ def create_stimuli_image(
     width = n * cell_size + 2 * padding
     height = (m + 1) * cell_size + 2 * padding + title_height
     
-    # Create image with white background
-    img = Image.new('RGBA', (width, height), color='#FFFFFF')
-    draw = ImageDraw.Draw(img)
-    
     # Colors
-    grid_color = '#CCCCCC'
-    header_bg = '#F5F5F5'
-    cell_bg = '#FFFFFF'
+    grid_color = (0xCC, 0xCC, 0xCC)
+    header_bg = (0xF5, 0xF5, 0xF5)
     
     # Try to load a title font
     title_font = None
@@ -214,50 +234,43 @@ def create_stimuli_image(
     if title_font is None:
         title_font = ImageFont.load_default()
     
-    # Draw title if requested
-    if show_title:
-        title_text = f"Observation: {obs_tuple}"
-        draw.text((padding, 8), title_text, fill='#333333', font=title_font)
-    
-    # Starting position for grid
+    # Grid geometry
     start_y = padding + title_height
-    
-    # Draw cells and paste emojis
-    for row in range(m + 1):  # 0 = header, 1-m = trials
-        for col in range(n):
-            # Cell coordinates
-            x1 = padding + col * cell_size
-            y1 = start_y + row * cell_size
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-            
-            # Background color
-            bg = header_bg if row == 0 else cell_bg
-            
-            # Draw cell background (no outline)
-            draw.rectangle([x1, y1, x2, y2], fill=bg, outline=None)
-            
-            # Draw vertical lines (left edge of each cell, plus right edge of last column)
-            draw.line([(x1, start_y), (x1, start_y + (m + 1) * cell_size)], fill=grid_color, width=2)
-            if col == n - 1:
-                draw.line([(x2, start_y), (x2, start_y + (m + 1) * cell_size)], fill=grid_color, width=2)
-    
-    # Draw horizontal lines: top, below header, and bottom only
     grid_top = start_y
     grid_bottom = start_y + (m + 1) * cell_size
     header_bottom = start_y + cell_size
     grid_left = padding
     grid_right = padding + n * cell_size
     
-    draw.line([(grid_left, grid_top), (grid_right, grid_top)], fill=grid_color, width=2)           # Top
-    draw.line([(grid_left, header_bottom), (grid_right, header_bottom)], fill=grid_color, width=2) # Below header
-    draw.line([(grid_left, grid_bottom), (grid_right, grid_bottom)], fill=grid_color, width=2)     # Bottom
-    
-    # Now paste emojis (second pass to ensure they're on top)
-    for row in range(m + 1):
+    # Paint the grid on an uninitialized canvas, writing each background
+    # pixel once: white everywhere except the header background band
+    # (trial cells stay white)
+    canvas = np.empty((height, width, 3), dtype=np.uint8)
+    canvas[:grid_top] = 255
+    canvas[header_bottom:] = 255
+    canvas[grid_top:header_bottom, :grid_left] = 255
+    canvas[grid_top:header_bottom, grid_right + 1:] = 255
+    canvas[grid_top:header_bottom, grid_left:grid_right + 1] = header_bg
+    
+    # Lines are 2px wide: vertical at every column edge, horizontal at the
+    # top, below the header, and at the bottom
+    for x in range(grid_left, grid_right + 1, cell_size):
+        canvas[grid_top:grid_bottom + 1, x:x + 2] = grid_color
+    for y in (grid_top, header_bottom, grid_bottom):
+        canvas[y:y + 2, grid_left:grid_right + 1] = grid_color
+    
+    # Composite emojis (alpha channel for transparency), centered in cells.
+    # Every cell of a row has the same background, so each emoji is blended
+    # once per row and copied to the other columns.
+    emoji_arrays = {
+        key: np.asarray(emoji_img.convert("RGBA")) for key, emoji_img in emoji_images.items()
+    }
+    for row in range(m + 1):  # 0 = header, 1-m = trials
+        y1 = start_y + row * cell_size
+        row_tiles = {}
+        
         for col in range(n):
             x1 = padding + col * cell_size
-            y1 = start_y + row * cell_size
             
             # Determine which emoji to use
             if row == 0:
@@ -267,52 +280,138 @@ def create_stimuli_image(
                 num_successes = patient_successes[col]
                 emoji_key = "success" if trial_idx <= num_successes else "failure"
             
-            # Get emoji image
-            emoji_img = emoji_images[emoji_key]
-            
-            # Center emoji in cell
-            emoji_w, emoji_h = emoji_img.size
+            emoji_arr = emoji_arrays[emoji_key]
+            emoji_h, emoji_w = emoji_arr.shape[:2]
             paste_x = x1 + (cell_size - emoji_w) // 2
             paste_y = y1 + (cell_size - emoji_h) // 2
             
-            # Paste emoji (with alpha channel for transparency)
-            img.paste(emoji_img, (paste_x, paste_y), emoji_img)
+            cell = canvas[paste_y:paste_y + emoji_h, paste_x:paste_x + emoji_w]
+            if emoji_key not in row_tiles:
+                row_tiles[emoji_key] = _composite_emoji(cell, emoji_arr)
+            cell[...] = row_tiles[emoji_key]
+    
+    img_rgb = Image.fromarray(canvas, "RGB")
     
-    # Convert to RGB for saving as PNG (removes alpha complexity)
-    img_rgb = Image.new('RGB', img.size, '#FFFFFF')
-    img_rgb.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
+    # Draw title if requested (the title band holds no grid or emojis)
+    if show_title:
+        title_text = f"Observation: {obs_tuple}"
+        ImageDraw.Draw(img_rgb).text((padding, 8), title_text, fill='#333333', font=title_font)
     
     # Save if path provided
     if output_path:
-        img_rgb.save(output_path, quality=95)
+        img_rgb.save(output_path, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
     
     return img_rgb
 
 
+def _alpha_blend(dst: np.ndarray, src: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """
+    Blend src over dst with an 8-bit alpha mask, for all pixels at once.
+    
+    Uses PIL's integer rounding, so the result matches Image.paste with a
+    mask pixel for pixel.
+    
+    Parameters
+    ----------
+    dst, src : np.ndarray
+        uint8 arrays of the same shape (H, W, C)
+    alpha : np.ndarray
+        uint8 mask of shape (H, W)
+    
+    Returns
+    -------
+    np.ndarray
+        Blended uint8 array of shape (H, W, C)
+    """
+    # src * a + dst * (255 - a) + 128 stays below 2**16
+    mask = alpha.astype(np.uint16)[..., None]
+    blended = src * mask + dst * (255 - mask) + 128
+    return (((blended >> 8) + blended) >> 8).astype(np.uint8)
+
+
+def _composite_emoji(background: np.ndarray, emoji_arr: np.ndarray) -> np.ndarray:
+    """
+    Composite an RGBA emoji over an opaque RGB background patch.
+    
+    Reproduces pasting the emoji into an RGBA image (which also blends the
+    alpha channel) and then flattening that image onto white for saving.
+    """
+    alpha = emoji_arr[..., 3]
+    rgb = _alpha_blend(background, emoji_arr[..., :3], alpha)
+    opaque = np.full(alpha.shape + (1,), 255, dtype=np.uint8)
+    coverage = _alpha_blend(opaque, alpha[..., None], alpha)[..., 0]
+    return _alpha_blend(np.full_like(rgb, 255), rgb, coverage)
+
+
+def generate_all_outcomes_array(n: int = 5, m: int = 4) -> np.ndarray:
+    """
+    All possible observation tuples for World(n, m) as one integer array.
+    
+    Parameters
+    ----------
+    n : int
+        Number of patients
+    m : int
+        Number of trials per patient
+    
+    Returns
+    -------
+    np.ndarray
+        Array of shape (C(n+m, m), m+1); row i is the i-th tuple in
+        lexicographic order (same order as generate_all_outcomes)
+    """
+    # by_total[t] holds every way to split t patients over the outcome
+    # columns added so far, in lexicographic order. Adding a column in
+    # front: for each value f it can take, append the splits of t - f.
+    by_total = [np.zeros((1 if t == 0 else 0, 0), dtype=np.int64) for t in range(n + 1)]
+    for _ in range(m + 1):
+        by_total = [
+            np.vstack([
+                np.hstack([np.full((len(by_total[t - f]), 1), f), by_total[t - f]])
+                for f in range(t + 1)
+            ])
+            for t in range(n + 1)
+        ]
+    return by_total[n]
+
+
 def generate_all_outcomes(n: int = 5, m: int = 4) -> List[Tuple[int, ...]]:
     """
     Generate all possible observation tuples for World(n, m).
     """
-    outcomes = []
-    for dividers in itertools.combinations(range(n + m), m):
-        counts = []
-        prev = -1
-        for d in dividers:
-            counts.append(d - prev - 1)
-            prev = d
-        counts.append(n + m - prev - 1)
-        outcomes.append(tuple(counts))
-    return outcomes
+    return list(map(tuple, generate_all_outcomes_array(n, m).tolist()))
+
+
+def _init_render_worker(emoji_images: Dict[str, Image.Image]) -> None:
+    """Give a worker process the emoji images once, not with every task."""
+    global _worker_emoji_images
+    _worker_emoji_images = emoji_images
+
+
+def _render_stimulus(obs_tuple: Tuple[int, ...], filename: str, n: int, m: int, cell_size: int) -> None:
+    """Render and save one stimulus in a worker process."""
+    create_stimuli_image(
+        obs_tuple,
+        n=n, m=m,
+        cell_size=cell_size,
+        output_path=filename,
+        show_title=False,
+        emoji_images=_worker_emoji_images
+    )
 
 
 def generate_all_stimuli(
     output_dir: str = "stimuli_emoji",
     n: int = 5,
     m: int = 4,
-    cell_size: int = 80
+    cell_size: int = 80,
+    n_jobs: Optional[int] = None
 ) -> None:
     """
     Generate stimuli images for all possible observations.
+    
+    Images are independent, so they are rendered and saved by n_jobs worker
+    processes (default: one per CPU); n_jobs=1 renders in this process.
     """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
@@ -325,31 +424,43 @@ def generate_all_stimuli(
     print(f"\nGenerating {len(outcomes)} stimuli images in '{output_dir}/'...")
     print("-" * 50)
     
-    for i, obs_tuple in enumerate(outcomes):
-        tuple_str = "_".join(map(str, obs_tuple))
-        filename = output_path / f"obs_{tuple_str}.png"
-        
-        create_stimuli_image(
-            obs_tuple,
-            n=n, m=m,
-            cell_size=cell_size,
-            output_path=str(filename),
-            show_title=False,
-            emoji_images=emoji_images
-        )
-        
-        # Progress indicator
-        progress = (i + 1) / len(outcomes)
-        bar_width = 40
-        filled = int(bar_width * progress)
-        bar = "█" * filled + "░" * (bar_width - filled)
-        print(f"\r  [{bar}] {i+1}/{len(outcomes)}", end="", flush=True)
+    filenames = [
+        str(output_path / f"obs_{'_'.join(map(str, obs_tuple))}.png")
+        for obs_tuple in outcomes
+    ]
+    
+    render = functools.partial(_render_stimulus, n=n, m=m, cell_size=cell_size)
+    
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    
+    if n_jobs == 1:
+        _init_render_worker(emoji_images)
+        _show_progress(map(render, outcomes, filenames), len(outcomes))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker,
+                                 initargs=(emoji_images,)) as executor:
+            rendered = executor.map(
+                render, outcomes, filenames,
+                chunksize=max(1, len(outcomes) // (4 * n_jobs))
+            )
+            _show_progress(rendered, len(outcomes))
     
     print()  # New line after progress bar
     print("-" * 50)
     print(f"✓ Done! Generated {len(outcomes)} images.")
 
 
+def _show_progress(results, total: int) -> None:
+    """Consume results in order, drawing a progress bar as each one arrives."""
+    for i, _ in enumerate(results):
+        progress = (i + 1) / total
+        bar_width = 40
+        filled = int(bar_width * progress)
+        bar = "█" * filled + "░" * (bar_width - filled)
+        print(f"\r  [{bar}] {i+1}/{total}", end="", flush=True)
+
+
 def main():
     """Main entry point."""
     print("=" * 60)
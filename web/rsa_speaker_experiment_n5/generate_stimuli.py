@@ -17,13 +17,31 @@ Naming: effective_{k}_v{variant}.png (e.g., effective_3_v0.png through effective
 """
 from PIL import Image
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from itertools import combinations
-import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import functools
+import http.client
+import io
+import math
+import os
+import urllib.parse
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Configuration
 N_PATIENTS = 5
 
+# Emoji x offsets for the default layout (72px emojis, 10px padding)
+_DEFAULT_EMOJI_SIZE, _DEFAULT_PADDING = 72, 10
+_X_COORDS = tuple(
+    _DEFAULT_PADDING + i * (_DEFAULT_EMOJI_SIZE + _DEFAULT_PADDING) for i in range(N_PATIENTS)
+)
+
 # Emoji Unicode code points for Twemoji URLs
 EMOJI_CONFIG = {
     "effective": {
@@ -38,6 +56,10 @@ EMOJI_CONFIG = {
 
 TWEMOJI_URL = "https://cdn.jsdelivr.net/gh/twitter/twemoji@latest/assets/72x72/{codepoint}.png"
 
+# PNG deflate level for saved stimuli: 1 saves about twice as fast as
+# PIL's default (6) for files roughly a fifth larger
+PNG_COMPRESS_LEVEL = 1
+
 
 def get_cache_dir() -> Path:
     """Get or create the emoji cache directory."""
@@ -46,119 +68,337 @@ def get_cache_dir() -> Path:
     return cache_dir
 
 
-def download_emoji(codepoint: str, cache_dir: Path) -> Path:
-    """Download an emoji PNG from Twemoji CDN."""
+def open_cdn_connection() -> http.client.HTTPSConnection:
+    """Open a keep-alive connection to the Twemoji CDN host."""
+    return http.client.HTTPSConnection(urllib.parse.urlsplit(TWEMOJI_URL).netloc, timeout=30)
+
+
+def download_emoji(
+    codepoint: str,
+    cache_dir: Path,
+    connection: Optional[http.client.HTTPSConnection] = None
+) -> Path:
+    """
+    Download an emoji PNG from Twemoji CDN.
+    
+    Cached files are returned without any request (the cache is keyed by
+    codepoint), and new files appear in the cache atomically. Pass an open
+    ``connection`` to reuse one TLS session across several downloads;
+    otherwise a connection is opened for this file only.
+    """
     cache_path = cache_dir / f"{codepoint}.png"
     
     if cache_path.exists():
         return cache_path
     
     url = TWEMOJI_URL.format(codepoint=codepoint)
+    own_connection = connection is None
+    if own_connection:
+        connection = open_cdn_connection()
     try:
-        urllib.request.urlretrieve(url, cache_path)
+        connection.request("GET", urllib.parse.urlsplit(url).path,
+                           headers={"Connection": "keep-alive"})
+        response = connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status} {response.reason}")
+        _write_cache_file(cache_path, body)
         return cache_path
     except Exception as e:
         raise RuntimeError(f"Failed to download emoji {codepoint}: {e}\nURL: {url}")
+    finally:
+        if own_connection:
+            connection.close()
+
+
+def _write_cache_file(cache_path: Path, body: bytes) -> None:
+    """
+    Write a downloaded file into the cache atomically.
+    
+    The body goes to a per-process temp name and is renamed into place, so
+    concurrent downloaders never leave a torn file in the cache.
+    """
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(body)
+    os.replace(tmp_path, cache_path)
+
+
+async def _download_emojis_http2(codepoints: List[str], cache_dir: Path) -> None:
+    """
+    Fetch several emojis concurrently over one multiplexed HTTP/2 connection.
+    
+    Every successful response is written to the cache; failed requests
+    (transport errors or non-200 status) are skipped, leaving those
+    codepoints for the caller's sequential fallback.
+    """
+    async with httpx.AsyncClient(http2=True, timeout=30) as client:
+        urls = [TWEMOJI_URL.format(codepoint=codepoint) for codepoint in codepoints]
+        responses = await asyncio.gather(
+            *(client.get(url) for url in urls), return_exceptions=True
+        )
+    
+    for codepoint, response in zip(codepoints, responses):
+        if isinstance(response, httpx.HTTPError):
+            continue
+        if isinstance(response, BaseException):
+            raise response
+        if response.status_code == 200:
+            _write_cache_file(cache_dir / f"{codepoint}.png", response.content)
+
+
+def _event_loop_running() -> bool:
+    """Whether this thread is already running an asyncio loop (e.g. a notebook)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
 
 
 def load_emoji_images(size: int = 72) -> Dict[str, Image.Image]:
-    """Download and load all required emoji images."""
+    """
+    Download and load all required emoji images.
+
+    Each emoji is flattened onto a white RGB tile once here, so stimuli
+    can be assembled with plain (unmasked) pastes. When the tiles use at
+    most 256 distinct colors (white included) they are returned as 'P'
+    images sharing one exact palette, making stimuli 1 byte/pixel without
+    any quantization loss; otherwise they stay RGB.
+    """
     cache_dir = get_cache_dir()
     emojis = {}
     
+    missing = [
+        config["codepoint"] for config in EMOJI_CONFIG.values()
+        if not (cache_dir / f"{config['codepoint']}.png").exists()
+    ]
+    
     print("Loading emoji images from Twemoji CDN...")
+    
+    # Several misses: fetch them concurrently over HTTP/2 when httpx (with
+    # its h2 extra) is installed and no event loop is already running
+    if len(missing) > 1 and httpx is not None and not _event_loop_running():
+        try:
+            asyncio.run(_download_emojis_http2(missing, cache_dir))
+        except (ImportError, httpx.HTTPError):
+            pass  # httpx without h2, or the client failed; use the path below
+        missing = [
+            codepoint for codepoint in missing
+            if not (cache_dir / f"{codepoint}.png").exists()
+        ]
+    
+    # One connection shared by the remaining cache misses, if any
+    connection = open_cdn_connection() if missing else None
+    
+    try:
+        png_paths = {
+            name: download_emoji(config["codepoint"], cache_dir, connection)
+            for name, config in EMOJI_CONFIG.items()
+        }
+    finally:
+        if connection is not None:
+            connection.close()
+    
     for name, config in EMOJI_CONFIG.items():
         print(f"  {config['char']} ({name})...", end=" ")
-        png_path = download_emoji(config["codepoint"], cache_dir)
+        png_path = png_paths[name]
         img = Image.open(png_path).convert("RGBA")
-        img = img.resize((size, size), Image.Resampling.LANCZOS)
-        emojis[name] = img
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+        # Composite onto white RGBA, then flatten to RGB by the resulting alpha
+        tile = Image.new('RGBA', (size, size), color='#FFFFFF')
+        tile.paste(img, (0, 0), img)
+        flat = Image.new('RGB', (size, size), '#FFFFFF')
+        flat.paste(tile, mask=tile.getchannel('A'))
+        emojis[name] = flat
         print("✓")
     
-    return emojis
+    return _to_shared_palette(emojis)
+
+
+def _to_shared_palette(tiles: Dict[str, Image.Image]) -> Dict[str, Image.Image]:
+    """
+    Losslessly convert RGB tiles to 'P' mode with one shared palette.
+    
+    White is palette index 0, so a blank 'P' canvas is white. Returns the
+    tiles unchanged if together they need more than 256 colors.
+    """
+    colors = {(255, 255, 255)}
+    for tile in tiles.values():
+        tile_colors = tile.getcolors(256)
+        if tile_colors is None:
+            return tiles
+        colors.update(color for _, color in tile_colors)
+    if len(colors) > 256:
+        return tiles
+    
+    palette = [(255, 255, 255)] + sorted(colors - {(255, 255, 255)})
+    palette_img = Image.new('P', (1, 1))
+    palette_img.putpalette([channel for color in palette for channel in color])
+    
+    # Every tile color is in the palette, so nearest-color mapping is exact
+    return {
+        name: tile.quantize(palette=palette_img, dither=Image.Dither.NONE)
+        for name, tile in tiles.items()
+    }
 
 
-def get_all_arrangements(num_effective: int) -> List[Tuple[int, ...]]:
+def iter_arrangements(num_effective: int) -> Iterator[int]:
     """
-    Get all possible arrangements of effective/ineffective patients.
+    Lazily yield all arrangements of effective/ineffective patients.
     
-    Returns a list of tuples, where each tuple contains the positions (0-4)
-    of effective patients.
+    Each arrangement is a bitmask, where bit i is set when patient i (0-4)
+    is effective. Masks are ordered like the position tuples of
+    itertools.combinations, so variant indices follow that order.
     
     Example for num_effective=2:
-    [(0,1), (0,2), (0,3), (0,4), (1,2), (1,3), (1,4), (2,3), (2,4), (3,4)]
+    0b00011, 0b00101, 0b01001, 0b10001, 0b00110, ...  # (0,1), (0,2), (0,3), (0,4), (1,2), ...
     """
-    return list(combinations(range(N_PATIENTS), num_effective))
+    for combo in combinations(range(N_PATIENTS), num_effective):
+        yield sum(1 << p for p in combo)
+
+
+@functools.lru_cache(maxsize=None)
+def get_all_arrangements(num_effective: int) -> Tuple[int, ...]:
+    """
+    Get all arrangements for num_effective as a memoized tuple of bitmasks.
+    
+    For callers that index or re-iterate the arrangements; single passes
+    over large N_PATIENTS should use iter_arrangements instead.
+    """
+    return tuple(iter_arrangements(num_effective))
+
+
+def mask_to_positions(effective_mask: int) -> Tuple[int, ...]:
+    """Convert an arrangement bitmask to the tuple of effective positions."""
+    return tuple(i for i in range(N_PATIENTS) if effective_mask & (1 << i))
 
 
 def create_stimuli_image(
-    effective_positions: Tuple[int, ...],
+    effective_mask: int,
     emoji_images: Dict[str, Image.Image],
     emoji_size: int = 72,
     padding: int = 10,
-    output_path: str = None
+    output_path: str = None,
+    canvas: Image.Image = None,
+    compress_level: int = PNG_COMPRESS_LEVEL
 ) -> Image.Image:
     """
     Create a row of 5 emojis with specified positions being effective.
     
     Parameters
     ----------
-    effective_positions : Tuple[int, ...]
-        Tuple of positions (0-4) that should show effective (happy) faces.
-        All other positions show ineffective (sick) faces.
+    effective_mask : int
+        Bitmask of positions (0-4) that should show effective (happy) faces,
+        bit i set for position i. All other positions show ineffective
+        (sick) faces.
     emoji_images : Dict[str, Image.Image]
-        Pre-loaded emoji images
+        Pre-loaded emoji tiles from load_emoji_images, already flattened
+        onto white (RGB, or 'P' with a shared palette)
     emoji_size : int
         Size of each emoji
     padding : int
         Padding between emojis
     output_path : str
         If provided, save the image to this path
+    canvas : Image.Image
+        If provided, a blank canvas from new_canvas to draw into instead of
+        allocating a new one. Every emoji slot is overwritten, so the same
+        canvas can be reused across calls.
+    compress_level : int
+        PNG deflate level (0-9) used when saving; raise to 9 for the
+        smallest files in a final run
     
     Returns
     -------
     Image.Image
-        The PIL Image object
+        The PIL Image object (``canvas`` itself when one is given)
     """
-    # Calculate dimensions
-    width = N_PATIENTS * emoji_size + (N_PATIENTS + 1) * padding
-    height = emoji_size + 2 * padding
-    
     # Create image with white background
-    img = Image.new('RGBA', (width, height), color='#FFFFFF')
+    if canvas is None:
+        img = new_canvas(emoji_images, emoji_size, padding)
+    else:
+        img = canvas
     
-    # Place emojis based on effective_positions
-    effective_set = set(effective_positions)
+    if (emoji_size, padding) == (_DEFAULT_EMOJI_SIZE, _DEFAULT_PADDING):
+        x_coords = _X_COORDS
+    else:
+        x_coords = tuple(padding + i * (emoji_size + padding) for i in range(N_PATIENTS))
+    
+    # Place emojis based on effective_mask
     for i in range(N_PATIENTS):
-        emoji_key = "effective" if i in effective_set else "ineffective"
+        emoji_key = "effective" if effective_mask & (1 << i) else "ineffective"
         emoji_img = emoji_images[emoji_key]
         
-        x = padding + i * (emoji_size + padding)
-        y = padding
-        
-        img.paste(emoji_img, (x, y), emoji_img)
-    
-    # Convert to RGB
-    img_rgb = Image.new('RGB', img.size, '#FFFFFF')
-    img_rgb.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
+        img.paste(emoji_img, (x_coords[i], padding))
     
     if output_path:
-        img_rgb.save(output_path, quality=95)
+        # Encode in memory, then write the file in one call
+        buf = io.BytesIO()
+        img.save(buf, format="PNG", compress_level=compress_level)
+        Path(output_path).write_bytes(buf.getbuffer())
     
-    return img_rgb
+    return img
 
 
-def positions_to_visual(effective_positions: Tuple[int, ...]) -> str:
-    """Convert positions to emoji visual representation."""
+def mask_to_visual(effective_mask: int) -> str:
+    """Convert an arrangement bitmask to emoji visual representation."""
     result = []
-    effective_set = set(effective_positions)
     for i in range(N_PATIENTS):
-        result.append("😃" if i in effective_set else "🤒")
+        result.append("😃" if effective_mask & (1 << i) else "🤒")
     return "".join(result)
 
 
-def generate_all_stimuli(output_dir: str = "stimuli_emoji_n5m1", emoji_size: int = 72) -> None:
-    """Generate stimuli images for all possible arrangements."""
+def new_canvas(emoji_images: Dict[str, Image.Image], emoji_size: int, padding: int = 10) -> Image.Image:
+    """Blank white canvas sized for one row of N_PATIENTS emojis, in the tiles' mode."""
+    width = N_PATIENTS * emoji_size + (N_PATIENTS + 1) * padding
+    height = emoji_size + 2 * padding
+    tile = next(iter(emoji_images.values()))
+    if tile.mode == 'P':
+        # Index 0 of the shared palette is white
+        img = Image.new('P', (width, height), 0)
+        img.putpalette(tile.getpalette())
+        return img
+    return Image.new('RGB', (width, height), color='#FFFFFF')
+
+
+def _init_render_worker(emoji_images: Dict[str, Image.Image], emoji_size: int) -> None:
+    """Give a worker process the emoji tiles and its own reusable canvas."""
+    global _worker_emoji_images, _worker_canvas
+    _worker_emoji_images = emoji_images
+    _worker_canvas = new_canvas(emoji_images, emoji_size)
+
+
+def _render_stimulus(
+    effective_mask: int,
+    filename: str,
+    emoji_size: int,
+    compress_level: int
+) -> None:
+    """Render and save one stimulus in a worker process."""
+    create_stimuli_image(
+        effective_mask=effective_mask,
+        emoji_images=_worker_emoji_images,
+        emoji_size=emoji_size,
+        output_path=filename,
+        canvas=_worker_canvas,
+        compress_level=compress_level
+    )
+
+
+def generate_all_stimuli(
+    output_dir: str = "stimuli_emoji_n5m1",
+    emoji_size: int = 72,
+    n_jobs: Optional[int] = None,
+    compress_level: int = PNG_COMPRESS_LEVEL
+) -> None:
+    """
+    Generate stimuli images for all possible arrangements.
+    
+    Images are independent, so they are rendered and saved by n_jobs worker
+    processes (default: one per CPU); n_jobs=1 renders in this process.
+    compress_level is the PNG deflate level passed to every save.
+    """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
@@ -167,29 +407,34 @@ def generate_all_stimuli(output_dir: str = "stimuli_emoji_n5m1", emoji_size: int
     print(f"\nGenerating all arrangement stimuli in '{output_dir}/'...")
     print("-" * 60)
     
-    total_images = 0
-    arrangement_counts = {}
+    # Tasks are streamed, never held as a list (2^N_PATIENTS of them)
+    arrangement_counts = {k: math.comb(N_PATIENTS, k) for k in range(N_PATIENTS + 1)}
+    total_images = sum(arrangement_counts.values())
+    masks = (effective_mask for _, _, effective_mask in _iter_tasks())
+    prefix = str(output_path) + os.sep
+    filenames = (
+        f"{prefix}effective_{num_effective}_v{variant_idx}.png"
+        for num_effective, variant_idx, _ in _iter_tasks()
+    )
     
-    for num_effective in range(N_PATIENTS + 1):
-        arrangements = get_all_arrangements(num_effective)
-        arrangement_counts[num_effective] = len(arrangements)
-        
-        print(f"\n{num_effective}/5 effective: {len(arrangements)} arrangement(s)")
-        
-        for variant_idx, positions in enumerate(arrangements):
-            filename = output_path / f"effective_{num_effective}_v{variant_idx}.png"
-            
-            create_stimuli_image(
-                effective_positions=positions,
-                emoji_images=emoji_images,
-                emoji_size=emoji_size,
-                output_path=str(filename)
+    render = functools.partial(
+        _render_stimulus, emoji_size=emoji_size, compress_level=compress_level
+    )
+    
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    
+    if n_jobs == 1:
+        _init_render_worker(emoji_images, emoji_size)
+        _report_rendered(_iter_tasks(), arrangement_counts, map(render, masks, filenames))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker,
+                                 initargs=(emoji_images, emoji_size)) as executor:
+            rendered = executor.map(
+                render, masks, filenames,
+                chunksize=max(1, total_images // (4 * n_jobs))
             )
-            
-            visual = positions_to_visual(positions)
-            positions_str = ",".join(map(str, positions)) if positions else "none"
-            print(f"  v{variant_idx}: {visual} (effective at positions: {positions_str}) → {filename.name}")
-            total_images += 1
+            _report_rendered(_iter_tasks(), arrangement_counts, rendered)
     
     print("\n" + "-" * 60)
     print(f"✓ Done! Generated {total_images} images.")
@@ -198,12 +443,39 @@ def generate_all_stimuli(output_dir: str = "stimuli_emoji_n5m1", emoji_size: int
         print(f"  {k} effective: {count} variants")
 
 
+def _iter_tasks() -> Iterator[Tuple[int, int, int]]:
+    """Yield (num_effective, variant_idx, effective_mask) for every stimulus, in file order."""
+    for num_effective in range(N_PATIENTS + 1):
+        for variant_idx, effective_mask in enumerate(iter_arrangements(num_effective)):
+            yield num_effective, variant_idx, effective_mask
+
+
+def _report_rendered(
+    tasks: Iterable[Tuple[int, int, int]],
+    arrangement_counts: Dict[int, int],
+    results: Iterable
+) -> None:
+    """Consume results in order, printing each image as it is saved."""
+    for (num_effective, variant_idx, effective_mask), _ in zip(tasks, results):
+        if variant_idx == 0:
+            print(f"\n{num_effective}/5 effective: {arrangement_counts[num_effective]} arrangement(s)")
+        
+        visual = mask_to_visual(effective_mask)
+        positions = mask_to_positions(effective_mask)
+        positions_str = ",".join(map(str, positions)) if positions else "none"
+        print(f"  v{variant_idx}: {visual} (effective at positions: {positions_str}) → "
+              f"effective_{num_effective}_v{variant_idx}.png")
+
+
 def generate_arrangement_map() -> Dict[int, List[Tuple[int, ...]]]:
     """
     Generate a mapping from num_effective to all possible arrangements.
     Useful for verification and JavaScript code generation.
     """
-    return {k: get_all_arrangements(k) for k in range(N_PATIENTS + 1)}
+    return {
+        k: [mask_to_positions(mask) for mask in get_all_arrangements(k)]
+        for k in range(N_PATIENTS + 1)
+    }
 
 
 def print_javascript_config():
@@ -211,25 +483,24 @@ def print_javascript_config():
     print("\n" + "=" * 60)
     print("JavaScript configuration for stimuli.js:")
     print("=" * 60)
-    print("""
-// Arrangement data: maps numEffective to list of variant indices
-const ARRANGEMENT_COUNTS = {
-    0: 1,   // C(5,0) = 1
-    1: 5,   // C(5,1) = 5
-    2: 10,  // C(5,2) = 10
-    3: 10,  // C(5,3) = 10
-    4: 5,   // C(5,4) = 5
-    5: 1    // C(5,5) = 1
-};
-
-// Total: 32 images
-""")
+    # C(N, k) straight from math.comb, so the block follows N_PATIENTS
+    counts = {k: math.comb(N_PATIENTS, k) for k in range(N_PATIENTS + 1)}
+    width = max(len(str(count)) for count in counts.values()) + 3
+    print("\n// Arrangement data: maps numEffective to list of variant indices")
+    print("const ARRANGEMENT_COUNTS = {")
+    for k, count in counts.items():
+        value = f"{count}," if k < N_PATIENTS else f"{count}"
+        print(f"    {k}: {value.ljust(width)}// C({N_PATIENTS},{k}) = {count}")
+    print("};")
+    print(f"\n// Total: {sum(counts.values())} images\n")
     
     print("\n// Detailed arrangement mappings (positions of effective patients):")
     print("const ARRANGEMENTS = {")
     for k in range(N_PATIENTS + 1):
-        arrangements = get_all_arrangements(k)
-        arr_str = ", ".join([str(list(a)) for a in arrangements])
+        arr_str = ", ".join(
+            "[" + ", ".join(map(str, mask_to_positions(mask))) + "]"
+            for mask in iter_arrangements(k)
+        )
         print(f"    {k}: [{arr_str}],")
     print("};")
 